@@ -3,13 +3,19 @@
 
 import sys
 import os
+import heapq
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "build" / "cpp"))
 import email_predictor
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # Base paths
 ROOT = Path(__file__).resolve().parents[1]  # -> /app
@@ -26,30 +32,42 @@ FIRM_MAP_PATH = str(DATA_DIR / "firm_template_map.msgpack")
 # API KEYS
 HUNTER_IO = ""
 
-# Initialize CatBoost Engine
-cat_std = email_predictor.CatBoostTemplatePredictor(CATBOOST_STD_MODEL_PATH)
-cat_comp = email_predictor.CatBoostTemplatePredictor(CATBOOST_COMP_MODEL_PATH)
-cat_engine = email_predictor.CatBoostEmailPredictionEngine(
-    cat_std,
-    cat_comp,
-    STD_TEMPLATES_PATH,
-    COMP_TEMPLATES_PATH,
-    FIRM_MAP_PATH,
-)
-cat_engine_verfied = email_predictor.CatBoostEmailPredictionEngine(
-    cat_std,
-    cat_comp,
-    STD_TEMPLATES_PATH,
-    COMP_TEMPLATES_PATH,
-    FIRM_MAP_PATH,
-    hunter_api_key=HUNTER_IO,
-)
+# Prediction cache sizing. Verified results expire so stale MX/SMTP statuses
+# are re-checked with Hunter.io.
+PREDICTION_CACHE_SIZE = 100_000
+VERIFIED_CACHE_TTL_S = 60 * 60
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Loads the CatBoost engine once at startup. A single engine serves both
+    routes, verification is toggled per call, so templates and models are only
+    loaded once and load failures surface before the API goes live."""
+    cat_std = email_predictor.CatBoostTemplatePredictor(CATBOOST_STD_MODEL_PATH)
+    cat_comp = email_predictor.CatBoostTemplatePredictor(CATBOOST_COMP_MODEL_PATH)
+    app.state.cat_engine = email_predictor.CatBoostEmailPredictionEngine(
+        cat_std,
+        cat_comp,
+        STD_TEMPLATES_PATH,
+        COMP_TEMPLATES_PATH,
+        FIRM_MAP_PATH,
+        hunter_api_key=HUNTER_IO,
+    )
+    yield
+
+    # Cached results belong to this engine instance
+    _cached_predict_unverified.cache_clear()
+    with _verified_cache_lock:
+        _verified_cache.clear()
+
 
 # FastAPI App
 app = FastAPI(
     title="Investor Email Prediction API",
     version="1.0",
     description="Predict investor email addresses using CatBoost models",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -68,19 +86,114 @@ class PredictionResponseItem(BaseModel):
     verification_score: Optional[int] = None
 
 
+# Prediction cache
+CachedPredictions = Tuple[Tuple[str, float], ...]
+
+_verified_cache: TTLCache = TTLCache(
+    maxsize=PREDICTION_CACHE_SIZE, ttl=VERIFIED_CACHE_TTL_S
+)
+_verified_cache_lock = threading.Lock()
+_verified_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _normalize_request(req: PredictionRequest) -> Tuple[str, str, Optional[str], int]:
+    """Builds the cache key for a request. Name and firm keep their case since
+    firm lookups in the engine are case sensitive."""
+    domain = req.domain.strip().lower() if req.domain else None
+    return req.name.strip(), req.firm.strip(), domain, req.top_k
+
+
+def _run_predict(
+    name: str, firm: str, domain: Optional[str], top_k: int, verified: bool
+) -> CachedPredictions:
+    """Calls the engine and flattens results into hashable (email, score) pairs."""
+    engine = app.state.cat_engine
+    if verified:
+        results = engine.predict(name, firm, top_k=top_k, domain=domain)
+        out = []
+        for r in results:
+            vr = getattr(r, "verification_result", None)  # VerificationResult | None
+            out.append((r.email, vr.score if vr else 0.0))
+        # Verification score is authoritative here, model rank breaks ties
+        return tuple(heapq.nlargest(3, out, key=lambda x: x[1]))
+
+    results = engine.predict(name, firm, top_k=top_k, domain=domain, verify=False)
+    return tuple((r.email, 0.0) for r in results[:3])
+
+
+@lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def _cached_predict_unverified(
+    name: str, firm: str, domain: Optional[str], top_k: int
+) -> CachedPredictions:
+    return _run_predict(name, firm, domain, top_k, verified=False)
+
+
+def _cached_predict(
+    name: str, firm: str, domain: Optional[str], top_k: int, verified: bool
+) -> CachedPredictions:
+    """Dispatches to the LRU cache for plain predictions, or the TTL cache for
+    verified predictions."""
+    if not verified:
+        return _cached_predict_unverified(name, firm, domain, top_k)
+
+    key = (name, firm, domain, top_k)
+    with _verified_cache_lock:
+        cached = _verified_cache.get(key)
+        if cached is not None:
+            _verified_cache_stats["hits"] += 1
+            return cached
+        _verified_cache_stats["misses"] += 1
+
+    out = _run_predict(name, firm, domain, top_k, verified=True)
+    with _verified_cache_lock:
+        _verified_cache[key] = out
+    return out
+
+
 # Routes
 @app.get("/")
 def root():
     return {"message": "Investor Email Prediction API is running."}
 
 
-@app.post("/predict/catboost", response_model=List[PredictionResponseItem])
-def predict_catboost(req: PredictionRequest):
+# The unverified routes return plain dicts, the response models only document
+# the schema so FastAPI skips re-validating items built here
+@app.post(
+    "/predict/catboost",
+    response_model=None,
+    responses={200: {"model": List[PredictionResponseItem]}},
+    description="Returns up to 3 predictions as `{email, score}` objects.",
+)
+def predict_catboost(req: PredictionRequest) -> List[dict]:
     try:
-        results = cat_engine.predict(
-            req.name, req.firm, top_k=req.top_k, domain=req.domain
+        cached = _cached_predict(*_normalize_request(req), verified=False)
+        return [{"email": email, "score": score} for email, score in cached]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post(
+    "/predict/catboost/batch",
+    response_model=None,
+    responses={200: {"model": List[List[PredictionResponseItem]]}},
+    description="Returns one list of up to 3 `{email, score}` objects per request.",
+)
+def predict_catboost_batch(reqs: List[PredictionRequest]) -> List[List[dict]]:
+    try:
+        # Split into parallel arrays for a single pybind call
+        names, firms, domains, top_ks = [], [], [], []
+        for name, firm, domain, top_k in map(_normalize_request, reqs):
+            names.append(name)
+            firms.append(firm)
+            domains.append(domain)
+            top_ks.append(top_k)
+
+        results = app.state.cat_engine.predict_batch(
+            names, firms, domains, top_ks, verify=False
         )
-        return [PredictionResponseItem(email=r.email, score=0) for r in results[:3]]
+        return [
+            [{"email": r.email, "score": 0.0} for r in preds[:3]] for preds in results
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,20 +201,24 @@ def predict_catboost(req: PredictionRequest):
 @app.post("/predict/catboost_verified", response_model=List[PredictionResponseItem])
 def predict_catboost_verify(req: PredictionRequest):
     try:
-        results = cat_engine_verfied.predict(
-            req.name, req.firm, top_k=req.top_k, domain=req.domain
-        )
-
-        out: List[PredictionResponseItem] = []
-        for r in results[:3]:
-            vr = getattr(r, "verification_result", None)  # VerificationResult | None
-            out.append(
-                PredictionResponseItem(
-                    email=r.email,
-                    score=vr.score if vr else 0.0,
-                )
-            )
-        out.sort(key=lambda x: x.score, reverse=True)
-        return out
+        cached = _cached_predict(*_normalize_request(req), verified=True)
+        return [
+            PredictionResponseItem(email=email, score=score) for email, score in cached
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics")
+def metrics():
+    info = _cached_predict_unverified.cache_info()
+    with _verified_cache_lock:
+        verified_stats = dict(_verified_cache_stats, size=len(_verified_cache))
+    return {
+        "prediction_cache": {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+        },
+        "verified_prediction_cache": verified_stats,
+    }
@@ -80,13 +80,16 @@ public:
    * @param firm_name Canonical firm name.
    * @param top_k Number of top results to return.
    * @param domain Optional domain string to append to local part.
+   * @param verify Run verification and enrichment when the pipelines are
+   * configured. Lets one engine serve both verified and unverified requests.
    * @return A vector of prediction results, optionally including full email
    * address.
    */
   std::vector<EmailPredictionResult>
   predict(const std::string &investor_name, const std::string &firm_name,
           std::size_t top_k = 3,
-          std::optional<std::string> domain = std::nullopt) const;
+          std::optional<std::string> domain = std::nullopt,
+          bool verify = true) const;
 
 private:
   std::shared_ptr<Pred> std_predictor_;
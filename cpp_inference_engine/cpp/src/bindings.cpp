@@ -27,6 +27,7 @@
 #include <memory>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <stdexcept>
 
 #include "email_predictor/catboost_template_predictor.hpp"
 #include "email_predictor/email_prediction_engine.hpp"
@@ -37,6 +38,33 @@ using namespace email_predictor;
 using namespace third_party::enrichment;
 using namespace third_party::verification;
 
+/**
+ * @brief Runs predict over parallel input arrays in a single call with the GIL
+ * released, amortizing the Python <-> C++ crossing across the whole batch.
+ */
+template <class Pred>
+std::vector<std::vector<EmailPredictionResult>>
+predict_batch(const EmailPredictionEngine<Pred> &engine,
+              const std::vector<std::string> &investor_names,
+              const std::vector<std::string> &firm_names,
+              const std::vector<std::optional<std::string>> &domains,
+              const std::vector<std::size_t> &top_ks, bool verify) {
+  const std::size_t n = investor_names.size();
+  if (firm_names.size() != n || domains.size() != n || top_ks.size() != n) {
+    throw std::invalid_argument("Batch inputs must all be the same length!");
+  }
+
+  std::vector<std::vector<EmailPredictionResult>> results;
+  results.reserve(n);
+
+  py::gil_scoped_release release;
+  for (std::size_t i = 0; i < n; ++i) {
+    results.push_back(engine.predict(investor_names[i], firm_names[i],
+                                     top_ks[i], domains[i], verify));
+  }
+  return results;
+}
+
 PYBIND11_MODULE(email_predictor, m) {
   m.doc() = R"pbdoc(
     Python bindings for the Email Prediction Engine.
@@ -179,7 +207,7 @@ Attributes:
       .def("predict",
            &EmailPredictionEngine<LightGBMTemplatePredictor>::predict,
            py::arg("investor_name"), py::arg("firm_name"), py::arg("top_k") = 3,
-           py::arg("domain") = std::nullopt,
+           py::arg("domain") = std::nullopt, py::arg("verify") = true,
            R"pbdoc(
             Predict the most likely email templates.
 
@@ -188,9 +216,28 @@ Attributes:
                 firm_name (str): Canonical firm name.
                 top_k (int): Number of top predictions to return. Default is 3.
                 domain (str, optional): If provided, constructs full emails using it. Resolves manually if not.
+                verify (bool): Verify and enrich results when API keys were provided. Default is True.
 
             Returns:
                 List[EmailPredictionResult]: Ranked template predictions.
+         )pbdoc")
+      .def("predict_batch", &predict_batch<LightGBMTemplatePredictor>,
+           py::arg("investor_names"), py::arg("firm_names"), py::arg("domains"),
+           py::arg("top_ks"), py::arg("verify") = true,
+           R"pbdoc(
+            Predict email templates for a batch of investors in one call.
+
+            The GIL is released while the batch is scored.
+
+            Args:
+                investor_names (List[str]): Full names of the investors.
+                firm_names (List[str]): Canonical firm names.
+                domains (List[Optional[str]]): Domains, None to resolve manually.
+                top_ks (List[int]): Number of top predictions per investor.
+                verify (bool): Verify and enrich results when API keys were provided. Default is True.
+
+            Returns:
+                List[List[EmailPredictionResult]]: Ranked predictions per investor.
          )pbdoc");
 
   // CatBoost EmailPredictionEngine
@@ -239,7 +286,7 @@ Attributes:
       .def("predict",
            &EmailPredictionEngine<CatBoostTemplatePredictor>::predict,
            py::arg("investor_name"), py::arg("firm_name"), py::arg("top_k") = 3,
-           py::arg("domain") = std::nullopt,
+           py::arg("domain") = std::nullopt, py::arg("verify") = true,
            R"pbdoc(
             Predict the most likely email templates.
 
@@ -248,8 +295,27 @@ Attributes:
                 firm_name (str): Canonical firm name.
                 top_k (int): Number of top predictions to return. Default is 3.
                 domain (str, optional): If provided, constructs full emails using it. Resolves manually if not.
+                verify (bool): Verify and enrich results when API keys were provided. Default is True.
 
             Returns:
                 List[EmailPredictionResult]: Ranked template predictions.
+         )pbdoc")
+      .def("predict_batch", &predict_batch<CatBoostTemplatePredictor>,
+           py::arg("investor_names"), py::arg("firm_names"), py::arg("domains"),
+           py::arg("top_ks"), py::arg("verify") = true,
+           R"pbdoc(
+            Predict email templates for a batch of investors in one call.
+
+            The GIL is released while the batch is scored.
+
+            Args:
+                investor_names (List[str]): Full names of the investors.
+                firm_names (List[str]): Canonical firm names.
+                domains (List[Optional[str]]): Domains, None to resolve manually.
+                top_ks (List[int]): Number of top predictions per investor.
+                verify (bool): Verify and enrich results when API keys were provided. Default is True.
+
+            Returns:
+                List[List[EmailPredictionResult]]: Ranked predictions per investor.
          )pbdoc");
 }
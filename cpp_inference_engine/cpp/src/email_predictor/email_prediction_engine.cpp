@@ -55,7 +55,7 @@ namespace email_predictor
     template <class Pred>
     std::vector<EmailPredictionResult> EmailPredictionEngine<Pred>::predict(
         const std::string &investor_name, const std::string &firm_name,
-        std::size_t top_k, std::optional<std::string> domain) const
+        std::size_t top_k, std::optional<std::string> domain, bool verify) const
     {
         std::string domain_string;
         // Resolve domain
@@ -130,8 +130,8 @@ namespace email_predictor
         // Track best score for enrichment
         EmailPredictionResult *best_result_ptr = nullptr;
 
-        // Verify if pipeline is available
-        if (verification_pipeline_.has_value())
+        // Verify if requested and pipeline is available
+        if (verify && verification_pipeline_.has_value())
         {
             auto &verifier = *verification_pipeline_;
             for (auto &result : results)
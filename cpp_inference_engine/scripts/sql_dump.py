@@ -3,119 +3,122 @@ Dumps inference relevant data from SQL DB into lightweight binary for CPP infere
 engine to load at run time.
 """
 
-import sqlalchemy as sa
+import connectorx as cx
+import pyarrow as pa
+import pyarrow.compute as pc
 import pandas as pd
 import msgpack
-import json
+import orjson
 from pathlib import Path
 
-# Start SQL
-engine = sa.create_engine("sqlite:///data/database.db")
-conn = engine.connect()
-meta = sa.MetaData()
-meta.reflect(bind=engine)
+# Start SQL, connectorx needs an absolute sqlite path
+DB_URI = f"sqlite://{Path('data/database.db').resolve()}"
+
+
+def read_sql_table(name: str, columns: list[str] | None = None) -> pa.Table:
+    """Reads a table, or a subset of its columns, into Arrow through connectorx."""
+    select = ", ".join(columns) if columns else "*"
+    return cx.read_sql(DB_URI, f"SELECT {select} FROM {name}", return_type="arrow")
+
+
+def records_by_key(tbl: pa.Table, key: str) -> dict:
+    """Maps each key column value to a record of the remaining columns. Arrow
+    keeps nullable integer columns as ints, where pandas would upcast to float."""
+    return dict(zip(tbl[key].to_pylist(), tbl.drop_columns([key]).to_pylist()))
+
+
+def write_msgpack(path: Path, obj: list | dict) -> None:
+    """Streams a list or dict to a msgpack file one item at a time, so the full
+    encoded buffer is never held in memory."""
+    packer = msgpack.Packer(use_bin_type=True)
+    with open(path, "wb") as f:
+        if isinstance(obj, dict):
+            f.write(packer.pack_map_header(len(obj)))
+            for key, value in obj.items():
+                f.write(packer.pack(key))
+                f.write(packer.pack(value))
+        else:
+            f.write(packer.pack_array_header(len(obj)))
+            for item in obj:
+                f.write(packer.pack(item))
+
+
+def write_arrow_ipc(path: Path, tbl: pa.Table) -> None:
+    """Writes a table as an Arrow IPC file, which readers can memory map for
+    zero-copy columnar loads."""
+    with pa.ipc.new_file(path, tbl.schema) as writer:
+        writer.write_table(tbl)
+
+
+def loads_sql_json(raw: str):
+    """JSON columns are written as json.dumps strings through SQLAlchemy's JSON
+    type, so the raw column text is encoded twice."""
+    return orjson.loads(orjson.loads(raw))
+
 
 # Get the split ids
 script_dir = Path(__file__).resolve().parent
-complex_ids = pd.read_csv(script_dir / "../cpp/data/complex_candidates.csv")[
-    "template_id"
-].to_list()
-std_ids = pd.read_csv(script_dir / "../cpp/data/std_candidates.csv")[
-    "template_id"
-].to_list()
+complex_ids = frozenset(
+    pd.read_csv(script_dir / "../cpp/data/complex_candidates.csv")["template_id"]
+)
+std_ids = frozenset(
+    pd.read_csv(script_dir / "../cpp/data/std_candidates.csv")["template_id"]
+)
 
 # Set save directory
 SAVE_DIRECTORY = script_dir / "../cpp/data"
 
 # Dump candidate templates
-std_cand = []
-complex_cand = []
-all_ids = []
-for row in conn.execute(sa.select(meta.tables["candidate_templates"])):
-    all_ids.append(row.template_id)
-    if row.template_id in complex_ids:
-        complex_cand.append(
-            {
-                "template_id": row.template_id,
-                "template": json.loads(row.template),
-                "support_count": row.support_count,
-                "coverage_pct": row.coverage_pct,
-                "in_mined_rules": row.in_mined_rules,
-                "max_rule_confidence": row.max_rule_confidence,
-                "avg_rule_confidence": row.avg_rule_confidence,
-                "uses_middle_name": row.uses_middle_name,
-                "uses_multiple_firsts": row.uses_multiple_firsts,
-                "uses_multiple_middles": row.uses_multiple_middles,
-                "uses_multiple_lasts": row.uses_multiple_lasts,
-            }
-        )
-
-    if row.template_id in std_ids:
-        std_cand.append(
-            {
-                "template_id": row.template_id,
-                "template": json.loads(row.template),
-                "support_count": row.support_count,
-                "coverage_pct": row.coverage_pct,
-                "in_mined_rules": row.in_mined_rules,
-                "max_rule_confidence": row.max_rule_confidence,
-                "avg_rule_confidence": row.avg_rule_confidence,
-                "uses_middle_name": row.uses_middle_name,
-                "uses_multiple_firsts": row.uses_multiple_firsts,
-                "uses_multiple_middles": row.uses_multiple_middles,
-                "uses_multiple_lasts": row.uses_multiple_lasts,
-            }
-        )
+candidate_templates = read_sql_table("candidate_templates")
+
+
+def filter_candidates(template_ids: frozenset) -> list:
+    """Filters candidate templates down to the given ids and parses templates."""
+    value_set = pa.array(
+        sorted(template_ids), type=candidate_templates.schema.field("template_id").type
+    )
+    mask = pc.is_in(candidate_templates["template_id"], value_set=value_set)
+    df = candidate_templates.filter(mask).to_pandas()
+    df["template"] = df["template"].map(loads_sql_json)
+    return df.to_dict(orient="records")
+
+
+std_cand = filter_candidates(std_ids)
+complex_cand = filter_candidates(complex_ids)
 
 print(f"{len(std_cand)} std candidate templates!")
 print(f"{len(complex_cand)} complex candidate templates!")
 
-with open(SAVE_DIRECTORY / "std_candidate_templates.msgpack", "wb") as f:
-    # Write to binary msgpack for CPP engine
-    f.write(msgpack.packb(std_cand, use_bin_type=True))  # type: ignore
-with open(SAVE_DIRECTORY / "complex_candidate_templates.msgpack", "wb") as f:
-    # Write to binary msgpack for CPP engine
-    f.write(msgpack.packb(complex_cand, use_bin_type=True))  # type: ignore
+# Write to binary msgpack for CPP engine
+write_msgpack(SAVE_DIRECTORY / "std_candidate_templates.msgpack", std_cand)
+write_msgpack(SAVE_DIRECTORY / "complex_candidate_templates.msgpack", complex_cand)
 
 # Dump firm_template_map
-firm_map = {}
-for row in conn.execute(sa.select(meta.tables["firm_template_map"])):
-    template_ids_int = [int(x) for x in json.loads(row.template_ids)]
-    firm_map[row.firm] = {
-        "template_ids": template_ids_int,
-        "num_templates": row.num_templates,
-        "num_investors": row.num_investors,
-        "diversity_ratio": row.diversity_ratio,
-        "is_single_template": row.is_single_template,
-        "is_shared_infra": row.is_shared_infra,
-        "firm_is_multi_domain": row.firm_is_multi_domain,
-    }
-
-with open(SAVE_DIRECTORY / "firm_template_map.msgpack", "wb") as f:
-    f.write(msgpack.packb(firm_map, use_bin_type=True))  # type: ignore
+firm_map_tbl = read_sql_table("firm_template_map")
+firm_map_tbl = firm_map_tbl.set_column(
+    firm_map_tbl.schema.get_field_index("template_ids"),
+    "template_ids",
+    pa.array(map(loads_sql_json, firm_map_tbl["template_ids"].to_pylist())),
+)
+firm_map = records_by_key(firm_map_tbl, "firm")
+
+write_msgpack(SAVE_DIRECTORY / "firm_template_map.msgpack", firm_map)
 print(f"{len(firm_map)} firms in template map!")
 
-# Dump canonical_firms
-canonical_firms = {}
-for row in conn.execute(sa.select(meta.tables["canonical_firms"])):
-    canonical_firms[row.firm] = {
-        "domain": row.domain,
-    }
-
-with open(SAVE_DIRECTORY / "canonical_firms.msgpack", "wb") as f:
-    f.write(msgpack.packb(canonical_firms, use_bin_type=True))  # type: ignore
-print(f"{len(firm_map)} firms in domain map!")
-
-
-# Dump canonical_firms
-firm_match_cache = {}
-for row in conn.execute(sa.select(meta.tables["firm_match_cache"])):
-    firm_match_cache[row.raw_firm] = {
-        "canonical_firm": row.canonical_firm,
-        "domain": row.domain,
-        "match_score": row.match_score,
-    }
-
-with open(SAVE_DIRECTORY / "firm_match_cache.msgpack", "wb") as f:
-    f.write(msgpack.packb(firm_match_cache, use_bin_type=True))  # type: ignore
+# Dump canonical_firms, msgpack for the CPP engine and Arrow IPC for columnar
+# readers
+canonical_firms_tbl = read_sql_table("canonical_firms", ["firm", "domain"])
+canonical_firms = records_by_key(canonical_firms_tbl, "firm")
+
+write_msgpack(SAVE_DIRECTORY / "canonical_firms.msgpack", canonical_firms)
+write_arrow_ipc(SAVE_DIRECTORY / "canonical_firms.arrow", canonical_firms_tbl)
+print(f"{len(canonical_firms)} firms in domain map!")
+
+
+# Dump firm_match_cache
+firm_match_cache_tbl = read_sql_table("firm_match_cache")
+firm_match_cache = records_by_key(firm_match_cache_tbl, "raw_firm")
+
+write_msgpack(SAVE_DIRECTORY / "firm_match_cache.msgpack", firm_match_cache)
+write_arrow_ipc(SAVE_DIRECTORY / "firm_match_cache.arrow", firm_match_cache_tbl)
 print(f"{len(firm_match_cache)} firms in cache!")
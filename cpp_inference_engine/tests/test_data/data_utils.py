@@ -0,0 +1,10 @@
+"""
+Helpers shared by the test data generators and the API benchmark harness.
+"""
+
+
+def extract_domain(email: object) -> str | None:
+    """Lowercased text after the first '@', None when there is none."""
+    if not isinstance(email, str):
+        return None
+    return email.partition("@")[2].lower() or None
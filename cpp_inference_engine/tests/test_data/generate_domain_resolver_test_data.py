@@ -2,16 +2,17 @@ from db.db import read_table
 from db.models import TableName
 from pathlib import Path
 import pandas as pd
+from data_utils import extract_domain
 
 # Read clean data
 lp_clean = read_table(TableName.COMBINED_CLEAN)
 
 # Get domains
-lp_clean["domain"] = lp_clean["email"].str.extract(r"@(.+)$")[0].str.lower()
+lp_clean["domain"] = lp_clean["email"].map(extract_domain)
 
 # Normalize firm names
 lp_clean["firm"] = (
-    lp_clean["firm"].astype(str).str.replace(" ", "", regex=False).str.lower()
+    lp_clean["firm"].astype(str).str.translate(str.maketrans("", "", " ")).str.lower()
 )
 
 # Count occurrences per (firm, domain)
@@ -21,13 +22,10 @@ counts = (
     .rename(columns={"size": "n"})
 )
 
-# Pick most-used domain per firm
-most = (
-    counts.sort_values(["firm", "n", "domain"], ascending=[True, False, True])
-    .groupby("firm", as_index=False)
-    .head(1)[["firm", "domain"]]
-    .reset_index(drop=True)
-)
+# Pick most-used domain per firm. Counts come out of the groupby sorted by
+# (firm, domain), so idxmax breaks ties on the alphabetically first domain
+idx = counts.groupby("firm")["n"].idxmax()
+most = counts.loc[idx, ["firm", "domain"]].reset_index(drop=True)
 
 # To csv
 script_dir = Path(__file__).resolve().parent
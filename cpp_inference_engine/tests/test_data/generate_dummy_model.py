@@ -1,14 +1,22 @@
 import lightgbm as lgb
 import numpy as np
+import os
 from pathlib import Path
 
 # Simulate 100 rows with 27 features (to match FeatureMatrixRow)
-X = np.random.rand(100, 27).astype(np.float32)
-y = np.random.randint(0, 2, size=100)  # Binary classification
+rng = np.random.default_rng(0)
+X = rng.random((100, 27), dtype=np.float32)
+y = rng.integers(0, 2, size=100, dtype=np.int8)  # Binary classification
 
 train_data = lgb.Dataset(X, label=y)
 
-params = {"objective": "binary", "metric": "binary_logloss", "verbosity": -1}
+params = {
+    "objective": "binary",
+    "metric": "binary_logloss",
+    "verbosity": -1,
+    "num_threads": os.cpu_count(),
+    "seed": 0,
+}
 
 # Resolve script directory
 script_dir = Path(__file__).resolve().parent
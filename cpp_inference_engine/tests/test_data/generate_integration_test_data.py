@@ -2,6 +2,7 @@ from db.db import read_table
 from db.models import TableName
 from pathlib import Path
 import pandas as pd
+from data_utils import extract_domain
 
 # Read clean data
 lp_clean = read_table(TableName.COMBINED_CLEAN)
@@ -15,7 +16,7 @@ comp_test = pd.read_csv(script_dir / "test_comp_ids.csv")
 test_ids = std_test["test_ids"].to_list() + comp_test["test_ids"].to_list()
 
 # Get domains
-lp_clean["domain"] = lp_clean["email"].str.extract(r"@(.+)$")[0].str.lower()
+lp_clean["domain"] = lp_clean["email"].map(extract_domain)
 
 # To csv
 test_data = lp_clean[lp_clean["id"].isin(test_ids)]
@@ -1,33 +1,57 @@
 import pandas as pd
 import re
+from functools import lru_cache
 from nameparser import HumanName
 from pathlib import Path
 
+# Cleaning patterns, built once. Trailing punctuation and repeated whitespace
+# are handled in a single regex pass
+_CLEAN = re.compile(r"(?:[.,;:!?)}\]]+$)|(?:\s{2,})")
+_QUOTES = str.maketrans("", "", "\"'<>")
+
+
+def _clean_repl(match: re.Match) -> str:
+    return " " if match.group().isspace() else ""
+
+
+# Column order of parse_name output
+PARSED_FIELDS = (
+    "normalized_name",
+    "first",
+    "middle",
+    "last",
+    "has_middle_name",
+    "has_multiple_first_names",
+    "has_multiple_middle_names",
+    "has_multiple_last_names",
+)
+
 
 def clean_generic(series: pd.Series) -> pd.Series:
     mask = series.notna()
     cleaned = series[mask].astype(str).str.strip().str.lower()
-    cleaned = (
-        cleaned.str.replace(r"[.,;:!?)}\]]+$", "", regex=True)
-        .str.replace(r"\s{2,}", " ", regex=True)
-        .str.replace(r"[\"'<>]", "", regex=True)
+    cleaned = cleaned.str.replace(_CLEAN, _clean_repl, regex=True).str.translate(
+        _QUOTES
     )
     return series.where(~mask, cleaned)
 
 
-def parse_name(name: str) -> dict:
+@lru_cache(maxsize=65536)
+def parse_name(name: str) -> tuple:
+    # Names repeat across the dataset, so parses are cached. Fields follow
+    # PARSED_FIELDS.
     n = HumanName(name)
 
-    return {
-        "normalized_name": name,
-        "first": n.first,
-        "middle": n.middle,
-        "last": n.last,
-        "has_middle_name": bool(n.middle),
-        "has_multiple_first_names": len(n.first.split()) > 1,
-        "has_multiple_middle_names": len(n.middle.split()) > 1,
-        "has_multiple_last_names": len(n.last.split()) > 1,
-    }
+    return (
+        name,
+        n.first,
+        n.middle,
+        n.last,
+        bool(n.middle),
+        len(n.first.split()) > 1,
+        len(n.middle.split()) > 1,
+        len(n.last.split()) > 1,
+    )
 
 
 def main():
@@ -41,10 +65,17 @@ def main():
 
     df["normalized_name"] = clean_generic(df["Name"])
 
-    parsed = df["normalized_name"].apply(parse_name).apply(pd.Series)
+    # Accumulate parsed fields column-wise and attach them in place
+    cols = {field: [] for field in PARSED_FIELDS}
+    for parsed in map(parse_name, df["normalized_name"]):
+        for field, value in zip(PARSED_FIELDS, parsed):
+            cols[field].append(value)
+    for field, values in cols.items():
+        df[field] = values
 
-    output = pd.concat([df["Name"], parsed], axis=1)
-    output.to_csv(script_dir / "nameparser_test_set.csv", index=False, encoding="utf-8")
+    df[["Name", *PARSED_FIELDS]].to_csv(
+        script_dir / "nameparser_test_set.csv", index=False, encoding="utf-8"
+    )
     print("Saved to nameparser_test_set.csv")
 
 
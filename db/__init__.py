@@ -5,7 +5,7 @@ SQL database handlers using sqlalchemy.
 """
 
 from .db import init_db, read_table, write_table
-from .models import TableName, create_tables, _TABLE_LOOKUP
+from .models import TableName, create_tables, _TABLE_LOOKUP, _TABLE_BY_NAME
 from .migrations import run_all_migrations
 
 __all__ = [
@@ -15,5 +15,6 @@ __all__ = [
     "TableName",
     "create_tables",
     "_TABLE_LOOKUP",
+    "_TABLE_BY_NAME",
     "run_all_migrations",
 ]
@@ -170,11 +170,12 @@ def write_table(table: m.TableName, df: pd.DataFrame, silent: bool = True) -> in
     with m.get_engine().begin() as conn:
         # If record has primary key, do upsert
         if records_with_pk:
-            # Update on conflict of primary key
-            stmt = sqlite_insert(tbl).on_conflict_do_update(
+            # Update on conflict of primary key, built from one insert construct
+            insert_stmt = sqlite_insert(tbl)
+            stmt = insert_stmt.on_conflict_do_update(
                 index_elements=pk_cols,
                 set_={
-                    col: getattr(sqlite_insert(tbl).excluded, col)
+                    col: insert_stmt.excluded[col]
                     for col in df_cols
                     if col not in pk_cols
                 },
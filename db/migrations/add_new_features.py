@@ -1,8 +1,5 @@
-from sqlalchemy import text, create_engine
-from db.models import DB_FILE, metadata
-
-# Get SQL engine
-engine = create_engine(f"sqlite:///{DB_FILE}")
+from sqlalchemy import text
+from db.models import get_engine
 
 
 def _add_column_if_missing(
@@ -16,7 +13,7 @@ def _add_column_if_missing(
         column_name (str): The name of the new column to add.
         column_type (str): The SQL data type for the new column (e.g., "BOOLEAN").
     """
-    with engine.connect() as conn:
+    with get_engine().connect() as conn:
         existing_cols = conn.execute(
             text(f"PRAGMA table_info({table_name})")
         ).fetchall()
@@ -49,9 +46,8 @@ def add_features() -> None:
     for col, dtype in feature_matrix_cols:
         _add_column_if_missing("feature_matrix", col, dtype)
 
-    # Refresh metadata to sync with DB
-    metadata.clear()
-    metadata.reflect(bind=engine)
+    # No metadata refresh, the Table definitions in db.models already declare
+    # these columns
 
 
 if __name__ == "__main__":
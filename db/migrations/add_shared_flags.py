@@ -1,48 +1,36 @@
-from sqlalchemy import text
-from sqlalchemy import create_engine
-from db.models import DB_FILE, metadata
+from sqlalchemy import text, Connection
+from db.models import get_engine
 
-# Get SQL engine
-engine = create_engine(f"sqlite:///{DB_FILE}")
 
-
-def _add_column_if_missing(
-    table_name: str, column_name: str, column_type: str, silent: bool = True
-) -> None:
+def _plan_missing_columns(
+    conn: Connection, table_name: str, desired: list[tuple[str, str]]
+) -> list[tuple[str, str]]:
     """
-    Adds a new column to a SQLite table if it does not already exist.
+    Finds which of the desired columns are missing from a SQLite table, using a
+    single `PRAGMA table_info` call.
 
     Args:
-        table_name (str): The name of the table to modify.
-        column_name (str): The name of the new column to add.
-        column_type (str): The SQL data type for the new column (e.g., "BOOLEAN").
+        conn (Connection): Open connection to the database.
+        table_name (str): The name of the table to inspect.
+        desired (list[tuple[str, str]]): (column name, SQL data type) pairs the
+            table should have.
 
     Returns:
-        None
+        list[tuple[str, str]]: The desired columns not yet present, in order.
     """
-    with engine.connect() as conn:
-        existing_cols = conn.execute(
-            text(f"PRAGMA table_info({table_name})")
-        ).fetchall()
-        column_names = [col[1] for col in existing_cols]
-
-        if column_name not in column_names:
-            if not silent:
-                print(f"Adding column '{column_name}' to '{table_name}'")
-            conn.execute(
-                text(
-                    f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type} DEFAULT 0"
-                )
-            )
-        else:
-            if not silent:
-                print(f"Column '{column_name}' already exists in '{table_name}'.")
+    existing_cols = conn.execute(text(f"PRAGMA table_info({table_name})")).fetchall()
+    column_names = {col[1] for col in existing_cols}
+    return [(name, type_) for name, type_ in desired if name not in column_names]
 
 
-def add_flags() -> None:
+def add_flags(silent: bool = True) -> None:
     """
     Executes a schema migration to add email/name structure flags to
     `lp_clean`, `gp_clean`, and `combined_clean` tables if they don't already exist.
+    All missing columns are added in a single transaction.
+
+    Args:
+        silent (bool): Suppresses per column progress output.
 
     Returns:
         None
@@ -58,17 +46,23 @@ def add_flags() -> None:
         "has_multiple_middle_names",
         "has_multiple_last_names",
     ]
+    # Add token_seq to clean, then each flag
+    spec = [("token_seq", "JSON")] + [(col, "BOOLEAN") for col in columns_to_add]
 
-    # Add each flag to each table
-    for table in ["lp_clean", "gp_clean", "combined_clean"]:
-        # Add token_seq to clean
-        _add_column_if_missing(table, "token_seq", "JSON")
-        for col in columns_to_add:
-            _add_column_if_missing(table, col, "BOOLEAN")
+    with get_engine().begin() as conn:
+        # pysqlite runs DDL in autocommit, open the transaction explicitly so
+        # every ALTER lands in one commit
+        conn.exec_driver_sql("BEGIN")
+        for table in ["lp_clean", "gp_clean", "combined_clean"]:
+            for name, type_ in _plan_missing_columns(conn, table, spec):
+                if not silent:
+                    print(f"Adding column '{name}' to '{table}'")
+                conn.execute(
+                    text(f"ALTER TABLE {table} ADD COLUMN {name} {type_} DEFAULT 0")
+                )
 
-    # Refresh metadata to sync with DB
-    metadata.clear()
-    metadata.reflect(bind=engine)
+    # No metadata refresh, the Table definitions in db.models already declare
+    # these columns
 
 
 if __name__ == "__main__":
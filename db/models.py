@@ -14,8 +14,12 @@ from sqlalchemy import (
     Boolean,
     Float,
     JSON,
+    event,
 )
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
 # Enums and Constants
 # ------------------------------------------
@@ -69,152 +73,137 @@ DB_FILE = os.path.join(DB_DIR, "database.db")
 # ------------------------------------------
 
 
-# Create SQLAlchemy engine for SQLite
-def get_engine() -> Engine:
-    """Get a cached SQLAlchemy engine for the database.
+# Connection level PRAGMAs applied to every new SQLite connection
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+@lru_cache(maxsize=1)
+def _engine_for(db_file: str) -> Engine:
+    """Build the engine for a database file, cached so the pool is shared.
+    Args:
+        db_file (str): Path to the SQLite database file.
     Returns:
         Engine: SQLAlchemy engine connected to the SQLite database.
     """
-    return create_engine(
-        f"sqlite:///{DB_FILE}",
+    engine = create_engine(
+        f"sqlite:///{db_file}",
         connect_args={"check_same_thread": False},
         echo=False,
     )
 
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+# Create SQLAlchemy engine for SQLite
+def get_engine() -> Engine:
+    """Get a cached SQLAlchemy engine for the database. The cache is keyed on
+    DB_FILE so repointing the module at another database builds a new engine.
+    Returns:
+        Engine: SQLAlchemy engine connected to the SQLite database.
+    """
+    return _engine_for(DB_FILE)
+
 
 # Define metadata
 metadata = MetaData()
 
+
+# Column factories, Column objects bind to a single Table so every call
+# returns fresh instances
+def _contact_columns(email_nullable: bool) -> list[Column]:
+    """Contact columns shared by the raw and clean LP/GP tables.
+    Args:
+        email_nullable (bool): Whether the email column accepts NULL.
+    Returns:
+        list[Column]: Fresh contact columns, in table order.
+    """
+    return [
+        Column("investor", Text, nullable=False),
+        Column("firm_type", Text),
+        Column("title", Text),
+        Column("firm", Text, nullable=False),
+        Column("alternative_name", Text),
+        Column("role", Text),
+        Column("job_title", Text),
+        Column("asset_class", Text),
+        Column("email", Text, nullable=email_nullable),
+        Column("tel", Text),
+        Column("city", Text),
+        Column("state", Text),
+        Column("country", Text),
+        Column("zip_code", Text),
+        Column("linkedin", Text),
+        Column("region", Text),
+        Column("address", Text),
+        Column("website", Text),
+        Column("general_email", Text),
+        Column("source_file", Text),
+    ]
+
+
+def _raw_columns() -> list[Column]:
+    """Columns of the raw LP/GP tables, excluding the time stamp."""
+    return [
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        *_contact_columns(email_nullable=True),
+    ]
+
+
+def _flag_columns() -> list[Column]:
+    """Email/name structure flags and token sequence of the clean tables."""
+    flags = [
+        "is_shared_infra",
+        "firm_is_multi_domain",
+        "has_german_char",
+        "has_nfkd_normalized",
+        "has_nickname",
+        "has_multiple_first_names",
+        "has_middle_name",
+        "has_multiple_middle_names",
+        "has_multiple_last_names",
+    ]
+    return [
+        *(Column(flag, Boolean, nullable=False, default=False) for flag in flags),
+        Column("token_seq", JSON),
+    ]
+
+
+def _clean_columns() -> list[Column]:
+    """Columns of the clean LP/GP tables, excluding the time stamp."""
+    return [
+        Column("id", Integer, primary_key=True, autoincrement=True, unique=True),
+        *_contact_columns(email_nullable=False),
+        *_flag_columns(),
+    ]
+
+
 # Raw LP table
-lp_raw = Table(
-    "lp_raw",
-    metadata,
-    Column("id", Integer, primary_key=True, autoincrement=True),
-    Column("investor", Text, nullable=False),
-    Column("firm_type", Text),
-    Column("title", Text),
-    Column("firm", Text, nullable=False),
-    Column("alternative_name", Text),
-    Column("role", Text),
-    Column("job_title", Text),
-    Column("asset_class", Text),
-    Column("email", Text),
-    Column("tel", Text),
-    Column("city", Text),
-    Column("state", Text),
-    Column("country", Text),
-    Column("zip_code", Text),
-    Column("linkedin", Text),
-    Column("region", Text),
-    Column("address", Text),
-    Column("website", Text),
-    Column("general_email", Text),
-    Column("source_file", Text),
-    Column("time_stamp", DateTime),
-)
+lp_raw = Table("lp_raw", metadata, *_raw_columns(), Column("time_stamp", DateTime))
 
 # Raw GP table
-gp_raw = Table(
-    "gp_raw",
-    metadata,
-    Column("id", Integer, primary_key=True, autoincrement=True),
-    Column("investor", Text, nullable=False),
-    Column("firm_type", Text),
-    Column("title", Text),
-    Column("firm", Text, nullable=False),
-    Column("alternative_name", Text),
-    Column("role", Text),
-    Column("job_title", Text),
-    Column("asset_class", Text),
-    Column("email", Text),
-    Column("tel", Text),
-    Column("city", Text),
-    Column("state", Text),
-    Column("country", Text),
-    Column("zip_code", Text),
-    Column("linkedin", Text),
-    Column("region", Text),
-    Column("address", Text),
-    Column("website", Text),
-    Column("general_email", Text),
-    Column("source_file", Text),
-    Column("time_stamp", DateTime),
-)
+gp_raw = Table("gp_raw", metadata, *_raw_columns(), Column("time_stamp", DateTime))
 
 # Clean LP table
 lp_clean = Table(
-    "lp_clean",
-    metadata,
-    Column("id", Integer, primary_key=True, autoincrement=True, unique=True),
-    Column("investor", Text, nullable=False),
-    Column("firm_type", Text),
-    Column("title", Text),
-    Column("firm", Text, nullable=False),
-    Column("alternative_name", Text),
-    Column("role", Text),
-    Column("job_title", Text),
-    Column("asset_class", Text),
-    Column("email", Text, nullable=False),
-    Column("tel", Text),
-    Column("city", Text),
-    Column("state", Text),
-    Column("country", Text),
-    Column("zip_code", Text),
-    Column("linkedin", Text),
-    Column("region", Text),
-    Column("address", Text),
-    Column("website", Text),
-    Column("general_email", Text),
-    Column("source_file", Text),
-    Column("is_shared_infra", Boolean, nullable=False, default=False),
-    Column("firm_is_multi_domain", Boolean, nullable=False, default=False),
-    Column("has_german_char", Boolean, nullable=False, default=False),
-    Column("has_nfkd_normalized", Boolean, nullable=False, default=False),
-    Column("has_nickname", Boolean, nullable=False, default=False),
-    Column("has_multiple_first_names", Boolean, nullable=False, default=False),
-    Column("has_middle_name", Boolean, nullable=False, default=False),
-    Column("has_multiple_middle_names", Boolean, nullable=False, default=False),
-    Column("has_multiple_last_names", Boolean, nullable=False, default=False),
-    Column("token_seq", JSON),
-    Column("time_stamp", DateTime),
+    "lp_clean", metadata, *_clean_columns(), Column("time_stamp", DateTime)
 )
 
 # Clean GP table
 gp_clean = Table(
-    "gp_clean",
-    metadata,
-    Column("id", Integer, primary_key=True, autoincrement=True, unique=True),
-    Column("investor", Text, nullable=False),
-    Column("firm_type", Text),
-    Column("title", Text),
-    Column("firm", Text, nullable=False),
-    Column("alternative_name", Text),
-    Column("role", Text),
-    Column("job_title", Text),
-    Column("asset_class", Text),
-    Column("email", Text, nullable=False),
-    Column("tel", Text),
-    Column("city", Text),
-    Column("state", Text),
-    Column("country", Text),
-    Column("zip_code", Text),
-    Column("linkedin", Text),
-    Column("region", Text),
-    Column("address", Text),
-    Column("website", Text),
-    Column("general_email", Text),
-    Column("source_file", Text),
-    Column("is_shared_infra", Boolean, nullable=False, default=False),
-    Column("firm_is_multi_domain", Boolean, nullable=False, default=False),
-    Column("has_german_char", Boolean, nullable=False, default=False),
-    Column("has_nfkd_normalized", Boolean, nullable=False, default=False),
-    Column("has_nickname", Boolean, nullable=False, default=False),
-    Column("has_multiple_first_names", Boolean, nullable=False, default=False),
-    Column("has_middle_name", Boolean, nullable=False, default=False),
-    Column("has_multiple_middle_names", Boolean, nullable=False, default=False),
-    Column("has_multiple_last_names", Boolean, nullable=False, default=False),
-    Column("token_seq", JSON),
-    Column("time_stamp", DateTime),
+    "gp_clean", metadata, *_clean_columns(), Column("time_stamp", DateTime)
 )
 
 # Combined clean table
@@ -224,36 +213,8 @@ combined_clean = Table(
     Column("id", Integer, primary_key=True, autoincrement=True, unique=True),
     Column("source", Text, nullable=False),
     Column("record_id", Integer, nullable=False),
-    Column("investor", Text, nullable=False),
-    Column("firm_type", Text),
-    Column("title", Text),
-    Column("firm", Text, nullable=False),
-    Column("alternative_name", Text),
-    Column("role", Text),
-    Column("job_title", Text),
-    Column("asset_class", Text),
-    Column("email", Text, nullable=False),
-    Column("tel", Text),
-    Column("city", Text),
-    Column("state", Text),
-    Column("country", Text),
-    Column("zip_code", Text),
-    Column("linkedin", Text),
-    Column("region", Text),
-    Column("address", Text),
-    Column("website", Text),
-    Column("general_email", Text),
-    Column("source_file", Text),
-    Column("is_shared_infra", Boolean, nullable=False, default=False),
-    Column("firm_is_multi_domain", Boolean, nullable=False, default=False),
-    Column("has_german_char", Boolean, nullable=False, default=False),
-    Column("has_nfkd_normalized", Boolean, nullable=False, default=False),
-    Column("has_nickname", Boolean, nullable=False, default=False),
-    Column("has_multiple_first_names", Boolean, nullable=False, default=False),
-    Column("has_middle_name", Boolean, nullable=False, default=False),
-    Column("has_multiple_middle_names", Boolean, nullable=False, default=False),
-    Column("has_multiple_last_names", Boolean, nullable=False, default=False),
-    Column("token_seq", JSON),
+    *_contact_columns(email_nullable=False),
+    *_flag_columns(),
     Column("time_stamp", DateTime),
 )
 
@@ -353,14 +314,8 @@ feature_matrix = Table(
 )
 
 # Complex feature matrix
-feature_matrix_complex = Table(
-    "feature_matrix_complex",
-    metadata,
-    *[
-        Column(col.name, col.type, *col.constraints, nullable=col.nullable)
-        for col in feature_matrix.columns
-    ],
-    PrimaryKeyConstraint("clean_row_id", "template_id"),
+feature_matrix_complex = feature_matrix.to_metadata(
+    metadata, name="feature_matrix_complex"
 )
 
 
@@ -371,16 +326,24 @@ def create_tables():
     print("Tables created successfully.")
 
 
-_TABLE_LOOKUP: dict[TableName, Table] = {
-    TableName.LP: lp_raw,
-    TableName.GP: gp_raw,
-    TableName.LP_CLEAN: lp_clean,
-    TableName.GP_CLEAN: gp_clean,
-    TableName.COMBINED_CLEAN: combined_clean,
-    TableName.CANONICAL_FIRMS: canonical_firms,
-    TableName.FIRM_CACHE: firm_match_cache,
-    TableName.CANDIDATE_TEMPLATES: candidate_templates,
-    TableName.FIRM_TEMPLATE_MAP: firm_template_map,
-    TableName.FEATURE_MATRIX: feature_matrix,
-    TableName.FEATURE_MATRIX_COMPLEX: feature_matrix_complex,
-}
+# Read only table lookups, safe to cache without defensive copies
+_TABLE_LOOKUP: Mapping[TableName, Table] = MappingProxyType(
+    {
+        TableName.LP: lp_raw,
+        TableName.GP: gp_raw,
+        TableName.LP_CLEAN: lp_clean,
+        TableName.GP_CLEAN: gp_clean,
+        TableName.COMBINED_CLEAN: combined_clean,
+        TableName.CANONICAL_FIRMS: canonical_firms,
+        TableName.FIRM_CACHE: firm_match_cache,
+        TableName.CANDIDATE_TEMPLATES: candidate_templates,
+        TableName.FIRM_TEMPLATE_MAP: firm_template_map,
+        TableName.FEATURE_MATRIX: feature_matrix,
+        TableName.FEATURE_MATRIX_COMPLEX: feature_matrix_complex,
+    }
+)
+
+# String keyed variant for callers that already hold TableName values
+_TABLE_BY_NAME: Mapping[str, Table] = MappingProxyType(
+    {name.value: tbl for name, tbl in _TABLE_LOOKUP.items()}
+)
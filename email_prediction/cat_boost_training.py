@@ -1,12 +1,13 @@
-import gc
-import sqlite3
+import connectorx as cx
 import pandas as pd
+import pyarrow as pa
 import numpy as np
 from catboost import CatBoostRanker, Pool
 from typing import Tuple
 
 # Paths to files in Drive
 _DB_PATH = "/content/drive/MyDrive/Colab Notebooks/database.db"
+_DB_URI = f"sqlite://{_DB_PATH}"
 _STD_VAL_IDS = "/content/validation_std_ids.csv"
 _COMP_VAL_IDS = "/content/validation_comp_ids.csv"
 
@@ -26,6 +27,54 @@ _BEST_PARAMS = {
 }
 
 
+def _read_feature_table(query: str) -> pd.DataFrame:
+    """
+    Reads a feature matrix query columnar through Arrow, avoiding per cell Python
+    objects of the DB-API fetch path.
+
+    Boolean columns are cast to uint8 so they reach CatBoost as numeric features,
+    nullable ones would otherwise become object columns. Float columns are narrowed
+    to float32, the precision CatBoost stores features in anyway.
+
+    Args:
+        query (str): SQL query to run against the training database.
+
+    Returns:
+        pd.DataFrame: Query result.
+    """
+    tbl = cx.read_sql(_DB_URI, query, return_type="arrow")
+    schema = pa.schema(
+        [
+            field.with_type(pa.uint8()) if pa.types.is_boolean(field.type) else field
+            for field in tbl.schema
+        ]
+    )
+    df = tbl.cast(schema).to_pandas()
+
+    # Nullable integer and boolean columns come back as float64 too
+    float_cols = df.select_dtypes("float64").columns
+    df[float_cols] = df[float_cols].astype(np.float32)
+    return df
+
+
+def _contiguous_group_ids(ids: np.ndarray) -> np.ndarray:
+    """
+    Numbers runs of equal ids 0, 1, 2, ... for CatBoost's `group_id`, which expects the
+    rows of a group to be contiguous. A single pass over the sorted ids, no hash
+    groupby needed.
+
+    Args:
+        ids (np.ndarray): Query ids, with each group's rows adjacent.
+
+    Returns:
+        np.ndarray: Group index for every row.
+    """
+    starts = np.empty(ids.size, dtype=bool)
+    starts[:1] = True
+    starts[1:] = ids[1:] != ids[:-1]
+    return np.cumsum(starts) - 1
+
+
 def _compute_ranking_metrics(df: pd.DataFrame, k: int = 3):
     """
     Compute Accuracy@1, Recall@k, and MRR for a ranking prediction dataframe.
@@ -37,25 +86,32 @@ def _compute_ranking_metrics(df: pd.DataFrame, k: int = 3):
     Returns:
         Tuple[float, float, float]: (Accuracy@1, Recall@k, MRR)
     """
+    gid = df["clean_row_id"].to_numpy()
+    score = df["score"].to_numpy()
+    label = df["label"].to_numpy()
+    if gid.size == 0:
+        # No groups to average over
+        return np.nan, np.nan, np.nan
+
+    # Sort by group then descending score, lexsort is stable so ties keep row order
+    order = np.lexsort((-score, gid))
+    gid = gid[order]
+    hit = label[order] == 1
+
+    # Group boundaries and each row's rank within its group
+    starts = np.flatnonzero(np.r_[True, gid[1:] != gid[:-1]])
+    sizes = np.diff(np.r_[starts, gid.size])
+    rank = np.arange(gid.size) - np.repeat(starts, sizes)
+
     # Accuracy@1
-    top1 = df.loc[df.groupby("clean_row_id")["score"].idxmax()]
-    acc1 = (top1["label"] == 1).mean()
+    acc1 = hit[starts].mean()
 
     # Recall@k
-    topk = df.groupby("clean_row_id", group_keys=False).apply(
-        lambda g: g.nlargest(k, "score")
-    )
-    recall_k = topk.groupby("clean_row_id")["label"].max().mean()
+    recall_k = np.logical_or.reduceat(hit & (rank < k), starts).mean()
 
     # MRR
-    def reciprocal_rank(g: pd.DataFrame) -> float:
-        labels_sorted = g.sort_values("score", ascending=False)["label"].to_numpy()
-        for rank, label in enumerate(labels_sorted, start=1):
-            if label == 1:
-                return 1.0 / rank
-        return 0.0
-
-    mrr = df.groupby("clean_row_id", group_keys=False).apply(reciprocal_rank).mean()
+    first_hit = np.minimum.reduceat(np.where(hit, rank, gid.size), starts)
+    mrr = np.where(first_hit < gid.size, 1.0 / (first_hit + 1), 0.0).mean()
 
     return acc1, recall_k, mrr
 
@@ -80,30 +136,25 @@ def _train_catboost_model(
     Returns:
         CatBoostRanker: Trained CatBoost model.
     """
-    drop_cols = ["label", "clean_row_id", "investor", "firm", "template_id"]
+    # Non feature columns, label is popped off separately
+    drop_cols = ["clean_row_id", "investor", "firm", "template_id"]
 
-    # Train
-    train_group_sizes = train_df.groupby("clean_row_id", sort=False).size().tolist()
-    train_group_id = np.repeat(np.arange(len(train_group_sizes)), train_group_sizes)
+    # Train, columns are dropped in place so no feature copy is allocated
+    train_group_id = _contiguous_group_ids(train_df["clean_row_id"].to_numpy())
+    y_train = train_df.pop("label")
+    train_df.drop(columns=drop_cols, inplace=True)
 
-    X_train = train_df.drop(columns=drop_cols)
-    y_train = train_df["label"]
-    del train_df  # Free memory early
+    train_pool = Pool(data=train_df, label=y_train, group_id=train_group_id)
+    del train_df, y_train, train_group_id  # Free memory
 
-    train_pool = Pool(data=X_train, label=y_train, group_id=train_group_id)
-    del X_train, y_train, train_group_id  # Free memory
-    gc.collect()  # Call garbage collector to be extra sure
+    # Validation, keep ids and labels for scoring
+    val_row_ids = val_df["clean_row_id"].to_numpy()
+    val_group_id = _contiguous_group_ids(val_row_ids)
+    y_val = val_df.pop("label")
+    val_df.drop(columns=drop_cols, inplace=True)
 
-    # Validation
-    val_group_sizes = val_df.groupby("clean_row_id", sort=False).size().tolist()
-    val_group_id = np.repeat(np.arange(len(val_group_sizes)), val_group_sizes)
-
-    X_val = val_df.drop(columns=drop_cols)
-    y_val = val_df["label"]
-
-    val_pool = Pool(data=X_val, label=y_val, group_id=val_group_id)
-    del X_val, y_val, val_group_id  # Free memory
-    gc.collect()  # Call garbage collector to be extra sure
+    val_pool = Pool(data=val_df, label=y_val, group_id=val_group_id)
+    del val_df, val_group_id  # Free memory
 
     # Train model
     model = CatBoostRanker(iterations=n_rounds, **parameters)
@@ -118,11 +169,16 @@ def _train_catboost_model(
     model.save_model(model_output_path)
     print(f"\nModel saved to: {model_output_path}")
 
-    # Score model
-    val_df = val_df.copy()  # preserve original structure
-    val_df["score"] = model.predict(val_pool)
+    # Score model, only the columns the metrics need
+    metrics_df = pd.DataFrame(
+        {
+            "clean_row_id": val_row_ids,
+            "label": y_val.to_numpy(),
+            "score": model.predict(val_pool),
+        }
+    )
 
-    acc1, recall3, mrr = _compute_ranking_metrics(val_df, k=3)
+    acc1, recall3, mrr = _compute_ranking_metrics(metrics_df, k=3)
 
     print("\nEvaluation Metrics (Validation Set):")
     print(f"Accuracy@1 : {acc1:.4f}")
@@ -159,29 +215,35 @@ def train_standard_and_complex_model(
         data_table: str, val_ids_path: str, model_path: str
     ) -> CatBoostRanker:
         print(f"Training model: {model_path}")
-        # Get data
-        with sqlite3.connect(_DB_PATH) as conn:
-            full_df = pd.read_sql_query(f"SELECT * FROM {data_table}", conn)
-
         # Get ids
         val_ids = (
-            pd.read_csv(val_ids_path)["validation_ids"].dropna().astype(int).tolist()
+            pd.read_csv(val_ids_path)["validation_ids"].dropna().astype(int).unique()
         )
 
-        # Split the set
-        val_ids_set = set(val_ids)
-        val_df = full_df[full_df["clean_row_id"].isin(val_ids_set)]
-        full_df = full_df[~full_df["clean_row_id"].isin(val_ids_set)]
+        # Split the set in SQL, the (clean_row_id, template_id) primary key index
+        # serves the id lookups and the ordering, which keeps each group's rows
+        # contiguous for CatBoost. Ids are ints so they can be inlined safely.
+        id_list = ", ".join(map(str, sorted(val_ids)))
+        val_df = _read_feature_table(
+            f"SELECT * FROM {data_table} WHERE clean_row_id IN ({id_list}) "
+            "ORDER BY clean_row_id"
+        )
+        train_df = _read_feature_table(
+            f"SELECT * FROM {data_table} WHERE clean_row_id NOT IN ({id_list}) "
+            "ORDER BY clean_row_id"
+        )
 
         # Train model
         return _train_catboost_model(
-            _BEST_PARAMS, full_df, val_df, n_rounds, model_path
+            _BEST_PARAMS, train_df, val_df, n_rounds, model_path
         )
 
     # Start with standard
     std_model = train_model("feature_matrix", _STD_VAL_IDS, "std_catboost_model.cbm")
-    # Then complex
-    comp_model = train_model("feature_matrix", _COMP_VAL_IDS, "comp_catboost_model.cbm")
+    # Then complex, built into its own table by the feature engineering pipeline
+    comp_model = train_model(
+        "feature_matrix_complex", _COMP_VAL_IDS, "comp_catboost_model.cbm"
+    )
 
     return std_model, comp_model
 
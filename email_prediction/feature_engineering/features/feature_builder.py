@@ -1,9 +1,63 @@
-import json
+import operator
+import orjson
+from collections import deque
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from scipy.sparse import csr_matrix
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
+from tqdm import tqdm
+from typing import Callable, Dict, Iterable, Iterator, Tuple
 from db.models import TableName
 from db.db import write_table
-from collections import Counter
+
+# Investor name flags and the template tokens that clash with them, one bit each
+_CLASH_RULES = (
+    ("has_middle_name", lambda tok: tok.startswith("m_") or "middle" in tok),
+    ("has_multiple_last_names", lambda tok: tok.startswith("l_") or "last" in tok),
+    (
+        "has_multiple_first_names",
+        lambda tok: tok.startswith("f_") or "first_original_1" in tok,
+    ),
+    ("has_nfkd_normalized", lambda tok: "nfkd" in tok),
+    ("has_nickname", lambda tok: "nickname" in tok),
+)
+
+# Feature matrix column -> clean data column for the per investor features
+_INVESTOR_FEATURES = {
+    "clean_row_id": "id",
+    "investor": "investor",
+    "firm": "firm",
+    "firm_is_shared_infra": "is_shared_infra",
+    "firm_is_multi_domain": "firm_is_multi_domain",
+    "investor_has_german_char": "has_german_char",
+    "investor_has_nfkd_normalized": "has_nfkd_normalized",
+    "investor_has_nickname": "has_nickname",
+    "investor_has_multiple_first_names": "has_multiple_first_names",
+    "investor_has_middle_name": "has_middle_name",
+    "investor_has_multiple_middle_names": "has_multiple_middle_names",
+    "investor_has_multiple_last_names": "has_multiple_last_names",
+}
+
+# Narrow in memory dtypes for feature columns, float columns stay float64 since
+# SQLite stores REAL as double and a float32 round trip would change the values
+_FEATURE_DTYPES = {
+    **{
+        feature: np.bool_
+        for feature in _INVESTOR_FEATURES
+        if feature.startswith(("firm_is_", "investor_has_"))
+    },
+    "template_support_count": np.int32,
+    "template_in_mined_rules": np.bool_,
+    "template_uses_middle_name": np.bool_,
+    "template_uses_multiple_firsts": np.bool_,
+    "template_uses_multiple_middles": np.bool_,
+    "template_uses_multiple_lasts": np.bool_,
+    "template_firm_support_count": np.int32,
+}
+
+# Lookups shared by every batch, set once per worker process by the pool initializer
+_WORKER_LOOKUPS: Dict[str, object] = {}
 
 
 def build_feature_matrix(
@@ -12,6 +66,7 @@ def build_feature_matrix(
     firm_template_map: pd.DataFrame,
     table: TableName,
     batch_size: int = 1000,
+    n_workers: int = 1,
 ) -> None:
     """
     Combines cleaned investor records with candidate email templates
@@ -25,6 +80,9 @@ def build_feature_matrix(
             and structural indicators.
         firm_template_map (pd.DataFrame): DataFrame mapping firms to template IDs and
             firm-level statistics.
+        table (TableName): Feature matrix table to write to.
+        batch_size (int): Number of investors per written batch.
+        n_workers (int): Worker processes building batches, 1 builds in process.
     """
     if table != TableName.FEATURE_MATRIX and table != TableName.FEATURE_MATRIX_COMPLEX:
         raise ValueError("Invalid table name selected")
@@ -36,41 +94,131 @@ def build_feature_matrix(
     firm_template_lookup = _build_firm_template_lookup(firm_template_map)
     firm_stats_lookup = _build_firm_stats_lookup(firm_template_map)
 
-    # Convert candidate templates to Python string
-    candidate_templates = candidate_templates.copy()
-    candidate_templates["template"] = candidate_templates["template"].apply(json.loads)
+    # Convert candidate templates to hashable token tuples once, assign leaves the
+    # caller's frame untouched
+    candidate_templates = candidate_templates.assign(
+        template=[
+            tuple(orjson.loads(s)) for s in candidate_templates["template"].to_numpy()
+        ]
+    )
 
-    # Construct feature matrices, row by row
+    # Candidate rows are laid out in template id order for every investor
     candidate_templates = candidate_templates.sort_values("template_id").reset_index(
         drop=True
     )
+    templates = _template_features(candidate_templates)
+
+    # Hash every template sequence once per run, batches then only look up their
+    # investors' sequences and labels compare integer codes
+    template_codes, template_seqs = pd.factorize(templates.pop("template"))
+    templates["_template_code"] = template_codes
+    template_seqs = pd.Index(template_seqs, tupleize_cols=False)
+    firm_templates = _firm_template_matrix(
+        firm_template_lookup, templates["template_id"]
+    )
+    firm_stats = _flatten_firm_stats_lookup(firm_stats_lookup)
+
+    # Batches are independent and only differ in their investors
+    lookups = {
+        "templates": templates,
+        "template_seqs": template_seqs,
+        "firm_templates": firm_templates,
+        "firm_stats": firm_stats,
+    }
+    batches = (
+        clean_data.iloc[start : start + batch_size]
+        for start in range(0, len(clean_data), batch_size)
+    )
+
+    # Build the sub-matrices of batch_size investors at a time, SQLite takes a
+    # single writer so batches are written here in order
+    with tqdm(
+        total=len(clean_data) * len(templates),
+        desc=table.value,
+        unit="row",
+        mininterval=1.0,
+    ) as progress:
+        if n_workers > 1:
+            # Lookups are sent to each worker once, and only a couple of batches
+            # per worker are in flight so built frames do not pile up unwritten
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_batch_worker,
+                initargs=(lookups,),
+            ) as pool:
+                built = _map_bounded(
+                    pool.submit, _build_rows_in_worker, batches, 2 * n_workers
+                )
+                _write_batches(table, built, progress)
+        else:
+            built = (_build_rows_for_batch(batch, **lookups) for batch in batches)
+            _write_batches(table, built, progress)
+
+
+def _init_batch_worker(lookups: Dict[str, object]) -> None:
+    """
+    Stores the shared lookups in a worker process, so tasks only carry their batch.
+
+    Args:
+        lookups (Dict[str, object]): Keyword arguments of `_build_rows_for_batch`
+            other than the batch.
+    """
+    _WORKER_LOOKUPS.update(lookups)
 
-    # Buffer for writing
-    buffer: List[pd.DataFrame] = []
-    pairs_in_batch = 0
-    total_pairs = 0
-    for _, clean_row in clean_data.iterrows():
-        if total_pairs % 5000 == 0:
-            print(f"{total_pairs} features built out of {clean_data.shape[0]}")
-        submatrix_rows = _build_rows_for_investor(
-            clean_row, candidate_templates, firm_template_lookup, firm_stats_lookup
-        )
-        df = pd.DataFrame(submatrix_rows)
-
-        # Accumulate
-        buffer.append(df)
-        pairs_in_batch += 1
-        total_pairs += 1
-
-        if pairs_in_batch >= batch_size:
-            # Write batch
-            write_table(table, pd.concat(buffer, ignore_index=True))
-            buffer.clear()
-            pairs_in_batch = 0
-
-    # flush remainder
-    if buffer:
-        write_table(table, pd.concat(buffer, ignore_index=True))
+
+def _build_rows_in_worker(clean_batch: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds a batch's feature rows in a worker process from its stored lookups.
+
+    Args:
+        clean_batch (pd.DataFrame): A batch of cleaned rows.
+
+    Returns:
+        pd.DataFrame: Feature rows for the batch.
+    """
+    return _build_rows_for_batch(clean_batch, **_WORKER_LOOKUPS)
+
+
+def _map_bounded(
+    submit: Callable, fn: Callable, items: Iterable, max_pending: int
+) -> Iterator:
+    """
+    Maps `fn` over `items` through an executor's `submit`, yielding results in input
+    order with at most `max_pending` tasks submitted and not yet yielded.
+
+    Args:
+        submit (Callable): Executor submit method.
+        fn (Callable): Function applied to each item.
+        items (Iterable): Inputs, consumed lazily.
+        max_pending (int): Most tasks in flight at once.
+
+    Yields:
+        The result of `fn` for each item, in order.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_batches(
+    table: TableName, batch_rows: Iterable[pd.DataFrame], progress: tqdm
+) -> None:
+    """
+    Writes built batches to the feature matrix table in order, ticking the progress
+    bar once per batch.
+
+    Args:
+        table (TableName): Feature matrix table to write to.
+        batch_rows (Iterable[pd.DataFrame]): Feature rows of each batch.
+        progress (tqdm): Progress bar counting feature rows.
+    """
+    for rows in batch_rows:
+        write_table(table, rows)
+        progress.update(len(rows))
 
 
 def _validate_columns(
@@ -163,44 +311,32 @@ def _build_firm_template_lookup(
                     ...
                 }
     """
-    # Flatten firm -> template list into counts
-    records = []
-    for _, row in firm_template_map.iterrows():
-        firm = row["firm"]
-        template_ids = json.loads(row["template_ids"])
-        # Count template ids
-        counts = Counter(template_ids)
-        # Build dict so we can group by firm later
-        for tid, count in counts.items():
-            records.append(
-                {
-                    "firm": firm,
-                    "template_ids": tid,
-                    "firm_template_support_count": count,
-                }
-            )
-    # Flatten to df
-    flat_df = pd.DataFrame(records)
+    # Flatten firm -> template list into one row per use
+    uses = (
+        firm_template_map[["firm"]]
+        .assign(template_id=firm_template_map["template_ids"].map(orjson.loads))
+        .explode("template_id")
+        .dropna(subset=["template_id"])
+    )
+
+    # Count template ids per firm and compare against firm totals
+    counts = (
+        uses.groupby(["firm", "template_id"], sort=False)
+        .size()
+        .rename("support_count")
+        .reset_index()
+    )
+    by_firm = counts.groupby("firm", sort=False)["support_count"]
+    counts["coverage_pct"] = counts["support_count"] / by_firm.transform("sum")
+    counts["is_top_template"] = counts["support_count"] == by_firm.transform("max")
 
     # Build enriched firm -> template id -> metadata lookup
-    output = {}
-    for firm, group in flat_df.groupby("firm"):
-        total = group["firm_template_support_count"].sum()
-        max_support = group["firm_template_support_count"].max()
-
-        # Build metadata dict
-        template_dict = {}
-        for _, row in group.iterrows():
-            tid = row["template_ids"]
-            support = row["firm_template_support_count"]
-            template_dict[tid] = {
-                "support_count": int(support),
-                "coverage_pct": support / total if total > 0 else 0.0,
-                "is_top_template": support == max_support,
-            }
-        # Add to firm dict
-        output[firm] = template_dict
-    return output
+    return {
+        firm: group.set_index("template_id")[
+            ["support_count", "coverage_pct", "is_top_template"]
+        ].to_dict(orient="index")
+        for firm, group in counts.groupby("firm", sort=False)
+    }
 
 
 def _build_firm_stats_lookup(firm_template_map: pd.DataFrame) -> Dict[str, Dict]:
@@ -213,142 +349,243 @@ def _build_firm_stats_lookup(firm_template_map: pd.DataFrame) -> Dict[str, Dict]
     Returns:
         Dict[str, Dict]: A mapping from firm name to a dictionary of numeric stats.
     """
-    return {
-        row["firm"]: {
-            "num_templates": row["num_templates"],
-            "num_investors": row["num_investors"],
-            "diversity_ratio": row["diversity_ratio"],
-            "is_single_template": row["is_single_template"],
+    # Later rows win for repeated firms, as with a dict built row by row
+    return (
+        firm_template_map.drop_duplicates("firm", keep="last")
+        .set_index("firm")[
+            ["num_templates", "num_investors", "diversity_ratio", "is_single_template"]
+        ]
+        .to_dict(orient="index")
+    )
+
+
+@lru_cache(maxsize=None)
+def _token_clash_bits(tok: str) -> int:
+    """Bits of the clash rules a template token falls under. Memoized since templates
+    share a small token vocabulary."""
+    return sum(
+        1 << bit for bit, (_, uses_token) in enumerate(_CLASH_RULES) if uses_token(tok)
+    )
+
+
+def _template_features(candidate_templates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Renames candidate template columns to their feature names and packs the name
+    tokens each template uses into a bitmask, for the name characteristic clash feature.
+
+    Args:
+        candidate_templates (pd.DataFrame): Candidate templates with token tuples.
+
+    Returns:
+        pd.DataFrame: Template features, in the input order.
+    """
+    # Pack the clash token families each template uses into a bitmask, OR-ing the
+    # bits of its tokens
+    clash_mask = np.array(
+        [
+            reduce(operator.or_, map(_token_clash_bits, toks), 0)
+            for toks in candidate_templates["template"]
+        ],
+        dtype=np.uint8,
+    )
+
+    return pd.DataFrame(
+        {
+            "template_id": candidate_templates["template_id"],
+            "template": candidate_templates["template"],
+            "template_support_count": candidate_templates["support_count"],
+            "template_coverage_pct": candidate_templates["coverage_pct"],
+            "template_in_mined_rules": candidate_templates["in_mined_rules"],
+            "template_max_rule_confidence": candidate_templates["max_rule_confidence"],
+            "template_avg_rule_confidence": candidate_templates["avg_rule_confidence"],
+            "template_uses_middle_name": candidate_templates["uses_middle_name"],
+            "template_uses_multiple_firsts": candidate_templates[
+                "uses_multiple_firsts"
+            ],
+            "template_uses_multiple_middles": candidate_templates[
+                "uses_multiple_middles"
+            ],
+            "template_uses_multiple_lasts": candidate_templates["uses_multiple_lasts"],
+            "_clash_mask": clash_mask,
         }
-        for _, row in firm_template_map.iterrows()
-    }
+    )
 
 
-def _build_rows_for_investor(
-    clean_row: pd.Series,
-    templates: pd.DataFrame,
+def _firm_template_matrix(
     firm_template_lookup: Dict[str, Dict[int, Dict[str, float]]],
-    firm_stats_lookup: Dict[str, Dict],
-) -> List[dict]:
+    template_ids: pd.Series,
+) -> Tuple[pd.Index, csr_matrix, Dict[str, np.ndarray]]:
     """
-    Builds the full sub-matrix for one investor-firm record.
+    Lays the firm -> template id -> metadata lookup out as a sparse (firm, template)
+    matrix, since firms use few of the candidate templates. Stored entries hold a 1
+    based position into flat feature arrays, whose slot 0 is the value for pairs the
+    firm never uses. The extra last row stands in for firms missing from the lookup.
 
-    Iterates over all candidate templates and creates one feature row for each.
-    A binary label is assigned based on whether the candidate matches the known
-    correct template for the investor.
+    Args:
+        firm_template_lookup (Dict[str, Dict[int, Dict[str, float]]]): Precomputed map of
+            firm to template IDs.
+        template_ids (pd.Series): Candidate template ids, in template row order.
+
+    Returns:
+        Tuple[pd.Index, csr_matrix, Dict[str, np.ndarray]]: Firm row index, the position
+            matrix and the feature arrays keyed by feature name.
+    """
+    firms = pd.Index(list(firm_template_lookup))
+    tmpl_pos = pd.Index(template_ids)
+
+    # One entry per (firm, template) pair, templates outside the candidate set
+    # never reach a feature row
+    rows, cols, metas = [], [], []
+    for f, templates in enumerate(firm_template_lookup.values()):
+        for t, meta in zip(tmpl_pos.get_indexer(list(templates)), templates.values()):
+            if t >= 0:
+                rows.append(f)
+                cols.append(t)
+                metas.append(meta)
+
+    positions = csr_matrix(
+        (np.arange(1, len(metas) + 1), (rows, cols)),
+        shape=(len(firms) + 1, len(tmpl_pos)),
+    )
+    values = {
+        "template_in_firm_templates": np.array([False] + [True] * len(metas)),
+        "template_firm_support_count": np.array(
+            [0] + [m["support_count"] for m in metas], dtype=np.int32
+        ),
+        "template_firm_coverage_pct": np.array(
+            [0.0] + [m["coverage_pct"] for m in metas], dtype=np.float64
+        ),
+        "template_is_top_template": np.array(
+            [False] + [m["is_top_template"] for m in metas], dtype=bool
+        ),
+    }
+    return firms, positions, values
+
+
+def _flatten_firm_stats_lookup(firm_stats_lookup: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Flattens the firm stats lookup into one row per firm, named as features.
 
     Args:
-        clean_row (pd.Series): A single cleaned row.
-        templates (pd.DataFrame): All candidate template records.
-        firm_template_lookup (Dict[str, Dict[int, Dict[str, float]]]): Precomputed map of firm to
-        template IDs.
         firm_stats_lookup (Dict[str, Dict]): Precomputed map of firm to numeric stats.
 
     Returns:
-        List[dict]: List of feature rows (as dicts) for that investor.
+        pd.DataFrame: Firm features keyed by firm.
+    """
+    return pd.DataFrame(
+        [
+            (
+                firm,
+                stats["num_templates"],
+                stats["num_investors"],
+                stats["diversity_ratio"],
+                stats["is_single_template"],
+            )
+            for firm, stats in firm_stats_lookup.items()
+        ],
+        columns=[
+            "firm",
+            "firm_num_templates",
+            "firm_num_investors",
+            "firm_diversity_ratio",
+            "firm_is_single_template",
+        ],
+    )
+
+
+def _build_rows_for_batch(
+    clean_batch: pd.DataFrame,
+    templates: pd.DataFrame,
+    template_seqs: pd.Index,
+    firm_templates: Tuple[pd.Index, csr_matrix, Dict[str, np.ndarray]],
+    firm_stats: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Builds the full sub-matrix for a batch of investor-firm records.
+
+    Every investor is paired with all candidate templates, one feature row per pair.
+    Columns are gathered straight into arrays and the frame is built once. A binary
+    label is assigned based on whether the candidate matches the known correct
+    template for the investor.
+
+    Args:
+        clean_batch (pd.DataFrame): A batch of cleaned rows.
+        templates (pd.DataFrame): Template features from `_template_features`, with
+            each template's sequence code in `_template_code`.
+        template_seqs (pd.Index): Distinct template token tuples, by sequence code.
+        firm_templates (Tuple[pd.Index, csr_matrix, Dict[str, np.ndarray]]): Sparse
+            firm template features from `_firm_template_matrix`.
+        firm_stats (pd.DataFrame): Firm features keyed by firm.
+
+    Returns:
+        pd.DataFrame: Feature rows for the batch, investor by investor.
 
     Raises:
         RuntimeError: If multiple or zero matching templates are found for a row.
     """
+    # Look up each investor's sequence code, -1 when no template has it
+    tmpl_codes = templates["_template_code"].to_numpy()
+    inv_seqs = clean_batch["token_seq"].map(tuple).to_numpy()
+    inv_codes = template_seqs.get_indexer(pd.Index(inv_seqs, tupleize_cols=False))
+
+    # Exactly one template must match each investor's token sequence, the spare
+    # last count is the zero that -1 codes index
+    seq_counts = np.bincount(tmpl_codes, minlength=len(template_seqs) + 1)
+    matches = seq_counts[inv_codes]
+    bad = np.flatnonzero(matches != 1)
+    if bad.size:
+        row_id = clean_batch["id"].iloc[bad[0]]
+        if matches[bad[0]] > 1:
+            raise RuntimeError(f"Multiple labels found for clean_row_id={row_id}")
+        raise RuntimeError(f"No label found for clean_row_id={row_id}")
+
+    n_inv, n_tmpl = len(clean_batch), len(templates)
+    inv_idx = np.repeat(np.arange(n_inv), n_tmpl)
+    tmpl_idx = np.tile(np.arange(n_tmpl), n_inv)
+
+    # Investor columns repeat once per template, template columns tile per investor
+    columns = {
+        feature: clean_batch[col].to_numpy(_FEATURE_DTYPES.get(feature))[inv_idx]
+        for feature, col in _INVESTOR_FEATURES.items()
+    }
+    columns.update(
+        {
+            col: templates[col].to_numpy(_FEATURE_DTYPES.get(col))[tmpl_idx]
+            for col in templates.columns.drop(["_template_code", "_clash_mask"])
+        }
+    )
 
-    def infer_token_clash_flags(clean_row, template_tokens):
-        """
-        Helper function to detect token and name clashes.
-        """
-        flags = []
-
-        if clean_row["has_middle_name"]:
-            if any(tok.startswith("m_") or "middle" in tok for tok in template_tokens):
-                flags.append("middle")
-
-        if clean_row["has_multiple_last_names"]:
-            if any(tok.startswith("l_") or "last" in tok for tok in template_tokens):
-                flags.append("last")
-
-        if clean_row["has_multiple_first_names"]:
-            if any(
-                tok.startswith("f_") or "first_original_1" in tok
-                for tok in template_tokens
-            ):
-                flags.append("first")
-
-        if clean_row["has_nfkd_normalized"]:
-            if any("nfkd" in tok for tok in template_tokens):
-                flags.append("nfkd")
-
-        if clean_row["has_nickname"]:
-            if any("nickname" in tok for tok in template_tokens):
-                flags.append("nickname")
-
-        return bool(flags)
-
-    # Get firm stats if exist
-    firm = clean_row["firm"]
-    firm_templates = firm_template_lookup.get(firm, {})
-    firm_stats = firm_stats_lookup.get(firm, {})
-
-    rows = []
-    label_found = False
-    # Construct candidate rows
-    for _, tmpl in templates.iterrows():
-        tmpl_id = tmpl["template_id"]
-        template_meta = firm_templates.get(tmpl_id, {})
-        label = int(tmpl["template"] == clean_row["token_seq"])
-        # Multiple labels should not happen
-        if label:
-            if label_found:
-                raise RuntimeError(
-                    f"Multiple labels found for clean_row_id={clean_row['id']}"
-                )
-            label_found = True
-
-        # Construct row
-        rows.append(
-            {
-                "clean_row_id": clean_row["id"],
-                "investor": clean_row["investor"],
-                "firm": firm,
-                "template_id": tmpl_id,
-                "template_in_firm_templates": tmpl_id in firm_templates,
-                "template_firm_support_count": template_meta.get("support_count", 0),
-                "template_firm_coverage_pct": template_meta.get("coverage_pct", 0.0),
-                "template_is_top_template": template_meta.get("is_top_template", False),
-                "firm_is_shared_infra": clean_row["is_shared_infra"],
-                "firm_is_multi_domain": clean_row["firm_is_multi_domain"],
-                "investor_has_german_char": clean_row["has_german_char"],
-                "investor_has_nfkd_normalized": clean_row["has_nfkd_normalized"],
-                "investor_has_nickname": clean_row["has_nickname"],
-                "investor_has_multiple_first_names": clean_row[
-                    "has_multiple_first_names"
-                ],
-                "investor_has_middle_name": clean_row["has_middle_name"],
-                "investor_has_multiple_middle_names": clean_row[
-                    "has_multiple_middle_names"
-                ],
-                "investor_has_multiple_last_names": clean_row[
-                    "has_multiple_last_names"
-                ],
-                "template_support_count": tmpl["support_count"],
-                "template_coverage_pct": tmpl["coverage_pct"],
-                "template_in_mined_rules": tmpl["in_mined_rules"],
-                "template_max_rule_confidence": tmpl["max_rule_confidence"],
-                "template_avg_rule_confidence": tmpl["avg_rule_confidence"],
-                "template_uses_middle_name": tmpl["uses_middle_name"],
-                "template_uses_multiple_firsts": tmpl["uses_multiple_firsts"],
-                "template_uses_multiple_middles": tmpl["uses_multiple_middles"],
-                "template_uses_multiple_lasts": tmpl["uses_multiple_lasts"],
-                "template_name_characteristic_clash": infer_token_clash_flags(
-                    clean_row, tmpl["template"]
-                ),
-                "firm_num_templates": firm_stats.get("num_templates"),
-                "firm_num_investors": firm_stats.get("num_investors"),
-                "firm_diversity_ratio": firm_stats.get("diversity_ratio"),
-                "firm_is_single_template": firm_stats.get("is_single_template"),
-                "label": label,
-            }
-        )
-
-    # At least one label required per investor candidate pair
-    if not label_found:
-        raise RuntimeError(f"No label found for clean_row_id={clean_row['id']}")
-    return rows
+    # Firm template features, firms missing from the lookup land on the last row
+    firms, positions, values = firm_templates
+    firm_pos = firms.get_indexer(clean_batch["firm"])
+    firm_pos[firm_pos < 0] = len(firms)
+    pos = np.asarray(positions[firm_pos[inv_idx], tmpl_idx]).ravel()
+    for col, arr in values.items():
+        columns[col] = arr[pos]
+
+    # Firm features, firms without stats are written as NULL
+    fs_pos = pd.Index(firm_stats["firm"]).get_indexer(columns["firm"])
+    for col in firm_stats.columns.drop("firm"):
+        stats = firm_stats[col].to_numpy(object)[fs_pos]
+        stats[fs_pos < 0] = None
+        columns[col] = stats
+
+    # Name characteristic clash, an investor flag paired with a template using
+    # that token family shows up as a shared bit
+    clash_need = np.zeros(n_inv, dtype=np.uint8)
+    for bit, (flag, _) in enumerate(_CLASH_RULES):
+        clash_need |= clean_batch[flag].to_numpy(bool).astype(np.uint8) << bit
+    clash_mask = templates["_clash_mask"].to_numpy()
+    columns["template_name_characteristic_clash"] = (
+        clash_need[inv_idx] & clash_mask[tmpl_idx]
+    ) != 0
+
+    # Each investor matched exactly one template above, so its positive row is
+    # set directly rather than comparing every pair
+    tmpl_of_code = np.empty(len(seq_counts), dtype=np.int64)
+    tmpl_of_code[tmpl_codes] = np.arange(n_tmpl)
+    label = np.zeros(n_inv * n_tmpl, dtype=np.int8)
+    label[np.arange(n_inv) * n_tmpl + tmpl_of_code[inv_codes]] = 1
+    columns["label"] = label
+
+    return pd.DataFrame(columns)
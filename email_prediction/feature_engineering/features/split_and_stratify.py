@@ -1,8 +1,27 @@
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from typing import Tuple, List
 
 
+def _hash_ids(ids: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Scrambles ids into seeded pseudo random keys with the splitmix64 finalizer, so the
+    same ids and seed always give the same order.
+
+    Args:
+        ids (np.ndarray): Integer row ids.
+        seed (int): Random seed.
+
+    Returns:
+        np.ndarray: uint64 hash per id.
+    """
+    offset = (seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    h = ids.astype(np.uint64) + np.uint64(offset)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
 def split_clean_ids(
     clean_df: pd.DataFrame,
     val_ratio: float = 0.2,
@@ -13,6 +32,9 @@ def split_clean_ids(
     Splits clean data into validation and test IDs using stratified sampling on domain.
     Singleton-domain rows are excluded from val/test, so they can go to training.
 
+    Each domain's rows are ordered by a seeded hash of their id, the first test_ratio
+    of them go to test and the next val_ratio to validation.
+
     Args:
         clean_df (pd.DataFrame): Clean dataframe with 'id' and 'email'.
         val_ratio (float): Proportion of data to assign to validation.
@@ -25,40 +47,27 @@ def split_clean_ids(
     Note:
         CoPilot was used to assist debugging issues around stratified split.
     """
-    df = clean_df.copy()
-    df["domain"] = df["email"].str.extract(r"@(.+)$")[0].str.lower()
+    df = pd.DataFrame(
+        {
+            "id": clean_df["id"].to_numpy(),
+            "domain": clean_df["email"].str.extract(r"@(.+)$")[0].str.lower(),
+        }
+    )
 
     # Filter domains that appear at least 2 times
-    domain_counts = df["domain"].value_counts()
-    eligible_domains = domain_counts[domain_counts > 1].index
-    strat_df = df[df["domain"].isin(eligible_domains)].copy()
-
-    # Stratified test split
-    strat_df_remain, strat_df_test = train_test_split(
-        strat_df,
-        test_size=test_ratio,
-        stratify=strat_df["domain"],
-        random_state=seed,
-    )
+    domain_size = df.groupby("domain", sort=False)["id"].transform("size")
+    df = df[domain_size > 1]
 
-    # Now recalculate domain counts for the remaining part before val split
-    remaining_domain_counts = strat_df_remain["domain"].value_counts()
-    val_eligible_domains = remaining_domain_counts[remaining_domain_counts > 1].index
-    val_strat_df = strat_df_remain[
-        strat_df_remain["domain"].isin(val_eligible_domains)
-    ].copy()
-
-    # Stratified val split
-    val_size_relative = val_ratio / (1.0 - test_ratio)
-    _, strat_df_val = train_test_split(
-        val_strat_df,
-        test_size=val_size_relative,
-        stratify=val_strat_df["domain"],
-        random_state=seed,
-    )
+    # Seeded order within each domain, then each row's position as a fraction
+    df = df.assign(h=_hash_ids(df["id"].to_numpy(), seed)).sort_values(["domain", "h"])
+    by_domain = df.groupby("domain", sort=False)["id"]
+    frac = by_domain.cumcount() / by_domain.transform("size")
+
+    test_mask = frac < test_ratio
+    val_mask = ~test_mask & (frac < test_ratio + val_ratio)
 
-    val_ids = strat_df_val["id"].tolist()
-    test_ids = strat_df_test["id"].tolist()
+    val_ids = df.loc[val_mask, "id"].tolist()
+    test_ids = df.loc[test_mask, "id"].tolist()
 
     print(f"Val: {len(val_ids)} | Test: {len(test_ids)}")
 
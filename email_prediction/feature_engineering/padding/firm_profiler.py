@@ -1,8 +1,28 @@
 import json
-from collections import defaultdict
+import orjson
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping
+
+
+@lru_cache(maxsize=None)
+def _parse_json_tuple(s: str) -> tuple:
+    """Parses a JSON array into a tuple. Memoized since every investor on a template
+    carries the same string, the tuple is immutable so hits can be shared."""
+    return tuple(orjson.loads(s))
+
+
+@lru_cache(maxsize=None)
+def _template_str_key(tpl: str) -> tuple:
+    """Drift key of a serialized template, memoized as each template string recurs
+    across firms and snapshots."""
+    try:
+        parsed = json.loads(tpl)
+        return tuple(parsed if isinstance(parsed, list) else [parsed])
+    except json.JSONDecodeError:
+        # treat raw string as a single-token template
+        return (tpl,)
 
 
 def build_firm_profile(
@@ -54,30 +74,47 @@ def build_firm_profile(
         if isinstance(x, (list, tuple)):
             return tuple(x)
         if isinstance(x, str):
-            return tuple(json.loads(x))
+            return _parse_json_tuple(x)
         return np.nan
 
+    # Filtering already yields new frames, columns are added with assign so the
+    # inputs are never copied wholesale or mutated
     df = data_df.loc[
-        data_df["token_seq"].notna(),
+        data_df["token_seq"].notna() & data_df["firm"].isin(firms),
         ["firm", "token_seq", "is_shared_infra", "firm_is_multi_domain", *name_flags],
-    ].copy()
-    df = df[df["firm"].isin(firms)]
-    ftm = firm_template_map_df.copy()
-    ftm = ftm[ftm["firm"].isin(firms)]
-    cand = candidate_templates_df.copy()
-    df["template_tuple"] = df["token_seq"].map(_to_tuple_or_json)
-    cand["template_tuple"] = cand["template"].map(_to_tuple_or_json)
-    ftm["template_ids"] = ftm["template_ids"].apply(
-        lambda v: json.loads(v) if isinstance(v, str) else v
+    ]
+    df = df.assign(template_tuple=df["token_seq"].map(_to_tuple_or_json))
+    ftm = firm_template_map_df[firm_template_map_df["firm"].isin(firms)]
+    ftm = ftm.assign(
+        template_ids=ftm["template_ids"].map(
+            lambda v: _parse_json_tuple(v) if isinstance(v, str) else v
+        )
+    )
+    cand = candidate_templates_df.assign(
+        template_tuple=candidate_templates_df["template"].map(_to_tuple_or_json)
     )
 
+    # Integer codes for firms and templates, so grouping and merging hash int64
+    # keys rather than strings and tuples. Missing values code as -1 and match nothing.
+    firm_codes, _ = pd.factorize(
+        pd.concat([df["firm"], ftm["firm"]], ignore_index=True)
+    )
+    tmpl_codes, _ = pd.factorize(
+        pd.concat([df["template_tuple"], cand["template_tuple"]], ignore_index=True)
+    )
+    df = df.assign(firm_code=firm_codes[: len(df)], tmpl_code=tmpl_codes[: len(df)])
+    ftm = ftm.assign(firm_code=firm_codes[len(df) :])
+    cand = cand.assign(tmpl_code=tmpl_codes[len(df) :])
+
     # Compute probabilities
     firm_meta = (
         df[["firm", "is_shared_infra", "firm_is_multi_domain"]]
         .drop_duplicates("firm")
         .set_index("firm")
     )
-    grp = df.groupby(["firm", "template_tuple"], sort=False)
+    grp = df[(df["firm_code"] >= 0) & (df["tmpl_code"] >= 0)].groupby(
+        ["firm_code", "tmpl_code"], sort=False
+    )
     usage = grp.size().rename("usage_count")
     flag_means = grp[name_flags].mean(numeric_only=True)
     agg = pd.concat([usage, flag_means], axis=1).reset_index()
@@ -87,21 +124,22 @@ def build_firm_profile(
 
     # Merge
     ftm_ex = (
-        ftm[["firm", "template_ids", "num_investors"]]
+        ftm[["firm", "firm_code", "template_ids", "num_investors"]]
         .explode("template_ids")
         .rename(columns={"template_ids": "template_id"})
     )
     firm_cand = ftm_ex.merge(
-        cand[["template_id", "template_tuple", "template"]],
+        cand[["template_id", "tmpl_code", "template"]],
         how="left",
         on="template_id",
     )
-    merged = firm_cand.merge(agg, how="left", on=["firm", "template_tuple"]).merge(
-        firm_totals, how="left", on="firm"
-    )
 
-    # Drop rows where template is nan
-    merged = merged.dropna(subset=["template"])
+    # Drop rows where template is nan, first so the codes left are all ints
+    firm_cand = firm_cand.dropna(subset=["template"]).astype({"tmpl_code": np.int64})
+
+    merged = firm_cand.merge(agg, how="left", on=["firm_code", "tmpl_code"]).merge(
+        firm_totals, how="left", on="firm_code"
+    )
 
     # Fill + compute stats
     merged["usage_count"] = merged["usage_count"].fillna(0).astype(int)
@@ -111,21 +149,24 @@ def build_firm_profile(
     merged["sampling_weight"] = np.where(
         merged["total_usage"] > 0, merged["usage_count"] / merged["total_usage"], 0.0
     )
-    merged["flag_probs"] = merged[name_flags].to_dict(orient="records")
-
-    # Per template
-    per_template = merged[["firm", "template", "sampling_weight", "flag_probs"]]
-    templates_per_firm = (
-        per_template.groupby("firm", sort=False, group_keys=False)
-        .apply(
-            lambda g: g[["template", "sampling_weight", "flag_probs"]].to_dict(
-                orient="records"
-            ),
-            include_groups=False,
+
+    # Per template, one pass over the rows appends each firm's template dicts.
+    # Flag probabilities stay a float block until the dicts are built.
+    probs = merged[name_flags].to_numpy().tolist()
+    templates_by_firm: Dict[str, List[Dict[str, Any]]] = {}
+    for firm, template, weight, p in zip(
+        merged["firm"], merged["template"], merged["sampling_weight"], probs
+    ):
+        templates_by_firm.setdefault(firm, []).append(
+            {
+                "template": template,
+                "sampling_weight": weight,
+                "flag_probs": dict(zip(name_flags, p)),
+            }
         )
-        .rename("templates")
-        .to_frame()
-    )
+    templates_per_firm = pd.Series(
+        templates_by_firm, name="templates", dtype=object
+    ).to_frame()
 
     # Drop firms that ended up with no templates
     templates_per_firm = templates_per_firm[
@@ -189,25 +230,80 @@ def summarize_drift(
         if isinstance(tpl, (list, tuple)):
             return tuple(tpl)
         if isinstance(tpl, str):
-            try:
-                parsed = json.loads(tpl)
-                return tuple(parsed if isinstance(parsed, list) else [parsed])
-            except json.JSONDecodeError:
-                # treat raw string as a single-token template
-                return (tpl,)
+            return _template_str_key(tpl)
         # Fallback: make it hashable
         return tuple(tpl) if tpl is not None else ("<NONE>",)
 
-    # Globals (across all firms)
-    global_max_flag_drift = defaultdict(float)  # flag -> max drift
-    global_max_sampling_weight_drift = 0.0  # max drift
-    global_template_structure_mismatches = 0  # count of template presence mismatches
-
     # Missing firms
     before_firms = set(k for k, v in firm_profiles_before.items() if v is not None)
     after_firms = set(k for k, v in firm_profiles_after.items() if v is not None)
     only_in_before = sorted(list(before_firms - after_firms))
     only_in_after = sorted(list(after_firms - before_firms))
+    common_firms = before_firms & after_firms
+
+    flag_defaults = [0.0] * len(name_flags)
+
+    def flatten(profiles: Dict[str, Optional[Dict[str, Any]]]) -> pd.DataFrame:
+        """One row per (firm, template) of the firms present on both sides."""
+        rows = [
+            (
+                firm,
+                template_key(t),
+                t.get("sampling_weight", 0.0),
+                *map((t.get("flag_probs", {}) or {}).get, name_flags, flag_defaults),
+            )
+            for firm in common_firms
+            for t in profiles[firm].get("templates", [])
+        ]
+        df = pd.DataFrame(
+            rows, columns=["firm", "tkey", "sampling_weight", *name_flags]
+        )
+        # Later entries win for repeated templates, as with a dict keyed on template
+        return df.drop_duplicates(["firm", "tkey"], keep="last")
+
+    # Line up templates of both snapshots, unmatched ones are structure mismatches
+    drift_cols = ["sampling_weight", *name_flags]
+    merged = flatten(firm_profiles_before).merge(
+        flatten(firm_profiles_after),
+        how="outer",
+        on=["firm", "tkey"],
+        suffixes=("_b", "_a"),
+        indicator=True,
+    )
+    matched = merged["_merge"] == "both"
+    firm_mismatches = (~matched).groupby(merged["firm"]).sum().to_dict()
+
+    # Absolute drift of matched templates, maxed per firm and overall. NaN drifts
+    # never count as a new max.
+    both = merged[matched]
+    drift = pd.DataFrame(
+        {
+            col: np.abs(
+                both[f"{col}_b"].astype(float).to_numpy()
+                - both[f"{col}_a"].astype(float).to_numpy()
+            )
+            for col in drift_cols
+        }
+    )
+    drift["firm"] = both["firm"].to_numpy()
+    firm_max_drift = (
+        drift.groupby("firm")[drift_cols].max().fillna(0.0).to_dict(orient="index")
+    )
+    global_max_drift = drift[drift_cols].max().fillna(0.0)
+
+    def flag_summary(max_drift: Optional[Mapping[str, float]]) -> Dict[str, Any]:
+        """Flag drift stats, empty when no templates were compared."""
+        flags = (
+            {} if max_drift is None else {f: float(max_drift[f]) for f in name_flags}
+        )
+        nonzero_flags = {k: v for k, v in flags.items() if v > 0}
+        return {
+            "max_flag_drift": dict(
+                sorted(flags.items(), key=lambda x: x[1], reverse=True)
+            ),
+            "total_flag_drift": float(sum(nonzero_flags.values())),
+            "num_flags_with_drift": int(len(nonzero_flags)),
+        }
 
     # Per-firm details
     per_firm: Dict[str, Dict[str, Any]] = {}
@@ -232,72 +328,27 @@ def summarize_drift(
                 if after is None and before is not None
                 else "missing_both",
             }
-            if not (before is None and after is None):
-                global_template_structure_mismatches += 1
             continue
 
-        # Build template lookups
-        before_templates = {template_key(t): t for t in before.get("templates", [])}
-        after_templates = {template_key(t): t for t in after.get("templates", [])}
-        all_templates = set(before_templates) | set(after_templates)
-
-        firm_max_flag_drift = defaultdict(float)
-        firm_max_sampling_weight_drift = 0.0
-        firm_template_mismatch_count = 0
-
-        for tmpl in all_templates:
-            b = before_templates.get(tmpl)
-            a = after_templates.get(tmpl)
-
-            if b is None or a is None:
-                firm_template_mismatch_count += 1
-                global_template_structure_mismatches += 1
-                continue
-
-            # Sampling weight drift
-            sw_b = b.get("sampling_weight", 0.0)
-            sw_a = a.get("sampling_weight", 0.0)
-            sw_diff = abs(float(sw_b) - float(sw_a))
-            firm_max_sampling_weight_drift = max(
-                firm_max_sampling_weight_drift, sw_diff
-            )
-            global_max_sampling_weight_drift = max(
-                global_max_sampling_weight_drift, sw_diff
-            )
-
-            # Name-flag probability drift
-            b_flags = b.get("flag_probs", {}) or {}
-            a_flags = a.get("flag_probs", {}) or {}
-            for flag in name_flags:
-                diff = abs(
-                    float(b_flags.get(flag, 0.0)) - float(a_flags.get(flag, 0.0))
-                )
-                if diff > firm_max_flag_drift[flag]:
-                    firm_max_flag_drift[flag] = diff
-                if diff > global_max_flag_drift[flag]:
-                    global_max_flag_drift[flag] = diff
-
-        nonzero_flags = {k: v for k, v in firm_max_flag_drift.items() if v > 0}
+        max_drift = firm_max_drift.get(firm)
         per_firm[firm] = {
-            "max_flag_drift": dict(
-                sorted(firm_max_flag_drift.items(), key=lambda x: x[1], reverse=True)
+            **flag_summary(max_drift),
+            "max_sampling_weight_drift": float(
+                0.0 if max_drift is None else max_drift["sampling_weight"]
             ),
-            "total_flag_drift": float(sum(nonzero_flags.values())),
-            "num_flags_with_drift": int(len(nonzero_flags)),
-            "max_sampling_weight_drift": float(firm_max_sampling_weight_drift),
-            "template_structure_mismatches": int(firm_template_mismatch_count),
+            "template_structure_mismatches": int(firm_mismatches.get(firm, 0)),
             "status": "ok",
         }
 
-    global_nonzero_flags = {k: v for k, v in global_max_flag_drift.items() if v > 0}
+    global_template_structure_mismatches = sum(firm_mismatches.values()) + len(
+        before_firms ^ after_firms
+    )
     return {
         "global": {
-            "max_flag_drift": dict(
-                sorted(global_max_flag_drift.items(), key=lambda x: x[1], reverse=True)
+            **flag_summary(global_max_drift if len(drift) else None),
+            "max_sampling_weight_drift": float(
+                global_max_drift["sampling_weight"] if len(drift) else 0.0
             ),
-            "total_flag_drift": float(sum(global_nonzero_flags.values())),
-            "num_flags_with_drift": int(len(global_nonzero_flags)),
-            "max_sampling_weight_drift": float(global_max_sampling_weight_drift),
             "template_structure_mismatches": int(global_template_structure_mismatches),
             "num_firms_compared": int(len(per_firm)),
         },
@@ -1,7 +1,14 @@
 import json
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Tuple, Dict, List, Optional
+
+# Fewer firms than this are generated in process, workers would not pay off
+_MIN_FIRMS_FOR_POOL = 4
 
 
 def generate_synthetic_investors_for_profiles(
@@ -9,6 +16,7 @@ def generate_synthetic_investors_for_profiles(
     n_padding: int,
     starting_id: int = 1_000_000,
     rng: Optional[np.random.Generator] = None,
+    n_workers: int = 1,
 ) -> Tuple[Dict[str, pd.DataFrame], int]:
     """
     Public API. Generate synthetic investors for all firms in `profiles`.
@@ -20,6 +28,7 @@ def generate_synthetic_investors_for_profiles(
         n_padding: target investors per firm (int) or per-firm map {firm: target}.
         starting_id: starting unique ID.
         rng: optional np.random.Generator for reproducibility.
+        n_workers: worker processes generating firms, 1 generates in process.
 
     Returns:
         ({firm: synthetic_df}, final_id)
@@ -30,93 +39,172 @@ def generate_synthetic_investors_for_profiles(
     if rng is None:
         rng = np.random.default_rng()
 
-    def _loads_template(t):
-        if isinstance(t, (list, tuple)):
-            return list(t)
-        if isinstance(t, str):
-            return json.loads(t)
-        return []
-
-    def _largest_remainder_counts(weights: np.ndarray, total: int) -> np.ndarray:
-        if total <= 0 or weights.size == 0:
-            return np.zeros_like(weights, dtype=int)
-        w = weights.astype(float)
-        s = w.sum()
-        w = (np.ones_like(w) / len(w)) if s <= 0 else (w / s)
-        raw = w * total
-        base = np.floor(raw).astype(int)
-        give = total - base.sum()
-        if give > 0:
-            idx = np.argpartition(-(raw - base), give - 1)[:give]
-            base[idx] += 1
-        return base
-
     out: Dict[str, pd.DataFrame] = {}
     curr_id = starting_id
 
+    # Plan every firm up front, template counts and id ranges are the only
+    # sequential part so firms can then be generated independently
+    jobs = []
+    firm_flags = []
     for firm, prof in profiles.items():
+        out[firm] = pd.DataFrame()
         if not prof or not prof.get("templates"):
-            out[firm] = pd.DataFrame()
             continue
 
         new_inv = int(n_padding) - int(prof.get("num_investors", 0))
         if new_inv <= 0:
-            out[firm] = pd.DataFrame()
             continue
 
         tmpls = prof["templates"]
         weights = np.array([t["sampling_weight"] for t in tmpls], dtype=float)
         counts = _largest_remainder_counts(weights, new_inv)
         if counts.sum() == 0:
-            out[firm] = pd.DataFrame()
             continue
 
         pos = counts > 0
         tmpls = [t for t, k in zip(tmpls, pos) if k]
         counts = counts[pos]
-        N = int(counts.sum())
 
-        ids = np.arange(curr_id + 1, curr_id + N + 1, dtype=np.int64)
-        curr_id = int(ids[-1])
-
-        firm_col = np.full(N, firm, dtype=object)
-        infra_col = np.full(N, bool(prof["is_shared_infra"]))
-        multi_col = np.full(N, bool(prof["firm_is_multi_domain"]))
-        investor = np.array(
-            [f"synthetic_investor_{firm}_{x}" for x in ids], dtype=object
-        )
-
-        # Token sequences
-        token_seq = []
-        extend = token_seq.extend
-        tmpl_lists = [_loads_template(t["template"]) for t in tmpls]
-        for seq, c in zip(tmpl_lists, counts):
-            extend([seq] * int(c))
-
-        # Flags
-        flag_names = list(tmpls[0]["flag_probs"].keys())
-        F = len(flag_names)
-        prob_rows = np.empty((N, F), dtype=float)
-        p = 0
-        for t, c in zip(tmpls, counts):
-            vec = np.fromiter(
-                (t["flag_probs"][fn] for fn in flag_names), dtype=float, count=F
-            )
-            prob_rows[p : p + c, :] = vec
-            p += int(c)
-        rnd = rng.random((N, F)) < prob_rows
-        flag_cols = {fn: rnd[:, i] for i, fn in enumerate(flag_names)}
-
-        out[firm] = pd.DataFrame(
-            {
-                "id": ids,
-                "firm": firm_col,
-                "investor": investor,
-                "is_shared_infra": infra_col,
-                "firm_is_multi_domain": multi_col,
-                "token_seq": token_seq,
-                **flag_cols,
-            }
+        jobs.append((firm, tmpls, counts, curr_id + 1))
+        firm_flags.append(
+            (bool(prof["is_shared_infra"]), bool(prof["firm_is_multi_domain"]))
         )
+        curr_id += int(counts.sum())
+
+    # One child generator per firm, so draws do not depend on n_workers. Children
+    # run on PCG64DXSM, seeded from the caller's generator so seeding still works.
+    children = [
+        np.random.Generator(np.random.PCG64DXSM(seed))
+        for seed in rng.bit_generator.seed_seq.spawn(len(jobs))
+    ]
+    job_args = [(*job[1:], child) for job, child in zip(jobs, children)]
+    if n_workers > 1 and len(jobs) >= _MIN_FIRMS_FOR_POOL:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_generate_firm, *zip(*job_args)))
+    else:
+        results = [_generate_firm(*args) for args in job_args]
+
+    if not results:
+        return out, curr_id
+
+    # Build a single frame from all firms' columns, then hand each firm a row
+    # slice of it rather than constructing one frame per firm. Flags are the
+    # same for every template, as produced by the firm profiler.
+    columns = {
+        name: np.concatenate([cols[name] for cols in results]) for name in results[0]
+    }
+    sizes = np.array([len(cols["id"]) for cols in results])
+    ends = np.cumsum(sizes)
+
+    # Firm as a categorical, one small code per row instead of a string reference
+    firm_codes = np.repeat(np.arange(len(jobs)), sizes)
+    firms = [job[0] for job in jobs]
+    firm_col = pd.Categorical.from_codes(firm_codes, categories=firms)
+    # Investor names are formatted in Arrow and kept as Arrow backed strings,
+    # no Python string per row
+    prefixes = pa.array([f"synthetic_investor_{firm}_" for firm in firms])
+    investor = pc.binary_join_element_wise(
+        prefixes.take(firm_codes), pc.cast(pa.array(columns["id"]), pa.string()), ""
+    )
+    # Firm level flags are repeated over each firm's rows in one pass
+    infra_col, multi_col = np.repeat(np.array(firm_flags, dtype=bool), sizes, axis=0).T
+    synthetic = pd.DataFrame(
+        {
+            "id": columns.pop("id"),
+            "firm": firm_col,
+            "investor": pd.arrays.ArrowStringArray(investor),
+            "is_shared_infra": infra_col,
+            "firm_is_multi_domain": multi_col,
+            **columns,
+        }
+    )
+    for job, start, end in zip(jobs, ends - sizes, ends):
+        part = synthetic.iloc[start:end]
+        part.index = pd.RangeIndex(end - start)
+        out[job[0]] = part
 
     return out, curr_id
+
+
+def _generate_firm(
+    tmpls: List[dict],
+    counts: np.ndarray,
+    first_id: int,
+    rng: np.random.Generator,
+) -> Dict[str, np.ndarray]:
+    """
+    Generates one firm's synthetic investors, `counts[i]` of them on template `tmpls[i]`.
+
+    Args:
+        tmpls: templates with at least one investor, as in the firm profile.
+        counts: investors per template.
+        first_id: id of the first synthetic investor, the rest follow consecutively.
+        rng: the firm's own generator.
+
+    Returns:
+        The firm's synthetic investor columns, without the firm level ones.
+    """
+    N = int(counts.sum())
+    ids = np.arange(first_id, first_id + N, dtype=np.int64)
+
+    # Token sequences, repeated as shared references in one allocation. The
+    # object array is filled by item so equal length lists stay 1-D.
+    tmpl_arr = np.empty(len(tmpls), dtype=object)
+    for i, t in enumerate(tmpls):
+        tmpl_arr[i] = _loads_template(t["template"])
+    token_seq = np.repeat(tmpl_arr, counts)
+
+    # Flags
+    flag_names = list(tmpls[0]["flag_probs"].keys())
+    F = len(flag_names)
+    # Filled flat in one pass, no per template row lists
+    template_probs = np.fromiter(
+        (t["flag_probs"][fn] for t in tmpls for fn in flag_names),
+        dtype=np.float64,
+        count=len(tmpls) * F,
+    ).reshape(len(tmpls), F)
+
+    # Threshold draws template block by template block into one bool buffer,
+    # the float draws never exist for all rows at once. Blocks are drawn in row
+    # order, so the generator stream matches a single (N, F) draw.
+    rnd = np.empty((N, F), dtype=bool)
+    ends = np.cumsum(counts)
+    for probs, start, end in zip(template_probs, ends - counts, ends):
+        np.less(rng.random((end - start, F)), probs, out=rnd[start:end])
+    flag_cols = {fn: rnd[:, i] for i, fn in enumerate(flag_names)}
+
+    return {
+        "id": ids,
+        "token_seq": token_seq,
+        **flag_cols,
+    }
+
+
+def _loads_template(t):
+    if isinstance(t, (list, tuple)):
+        return list(t)
+    if isinstance(t, str):
+        return _loads_template_str(t)
+    return []
+
+
+@lru_cache(maxsize=65536)
+def _loads_template_str(t: str) -> list:
+    # Firms share most templates, so each distinct string is parsed once. The
+    # list is shared by every row generated from it, as it already was per firm.
+    return json.loads(t)
+
+
+def _largest_remainder_counts(weights: np.ndarray, total: int) -> np.ndarray:
+    if total <= 0 or weights.size == 0:
+        return np.zeros_like(weights, dtype=int)
+    w = np.asarray(weights, dtype=float)
+    s = w.sum()
+    # Scale in one pass, shares are non-negative so truncation is the floor
+    raw = np.full(w.size, total / w.size) if s <= 0 else w * (total / s)
+    base = raw.astype(int)
+    give = total - int(base.sum())
+    if give > 0:
+        # Largest remainders first, ties go to the earlier template
+        base[np.argsort(base - raw, kind="stable")[:give]] += 1
+    return base
@@ -1,4 +1,5 @@
 import json
+import numpy as np
 import pandas as pd
 from db.db import read_table, init_db
 from db.models import TableName
@@ -15,7 +16,7 @@ from email_prediction.feature_engineering.features.split_and_stratify import (
 from email_prediction.feature_engineering.features.feature_builder import (
     build_feature_matrix,
 )
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple
 
 # Padding constants, check model development notebook for reasoning
 LOW_INVESTOR_THRESHOLD_STD = 40
@@ -59,31 +60,35 @@ def _split_dataset_by_complexity(
         "has_german_char",
     ]
 
-    # Create a single column flag
-    df["is_name_complex"] = df[complex_flags].any(axis=1)
+    # Create a single column flag, reduced over the column arrays with no
+    # intermediate sub-frame
+    df["is_name_complex"] = np.logical_or.reduce(
+        [df[c].to_numpy(dtype=bool) for c in complex_flags]
+    )
 
-    # Split into two datasets
-    complex_name_df = df[df["is_name_complex"]].copy()
-    standard_name_df = df[~df["is_name_complex"]].copy()
+    # Split into two datasets, take already returns copies
+    is_complex = df["is_name_complex"].to_numpy()
+    complex_name_df = df.take(np.flatnonzero(is_complex))
+    standard_name_df = df.take(np.flatnonzero(~is_complex))
 
     print(f"Complex names: {len(complex_name_df)}")
     print(f"Standard names: {len(standard_name_df)}")
     print(df["is_name_complex"].value_counts(normalize=True))
 
-    # JSON safe string form of token_seq
-    complex_name_df["token_seq_str"] = complex_name_df["token_seq"].apply(json.dumps)
-    standard_name_df["token_seq_str"] = standard_name_df["token_seq"].apply(json.dumps)
-
-    # Unique sequences seen in each subset
-    complex_token_set = set(complex_name_df["token_seq_str"])
-    standard_token_set = set(standard_name_df["token_seq_str"])
+    # Unique sequences seen in each subset, as tuples so membership is a hash
+    # lookup with no JSON serialization of every row
+    complex_token_set = set(map(tuple, complex_name_df["token_seq"]))
+    standard_token_set = set(map(tuple, standard_name_df["token_seq"]))
 
-    # Filter candidate_templates
+    # Filter candidate_templates, parsing each template once
+    template_tuples = candidate_templates["template"].map(
+        lambda t: tuple(json.loads(t)) if isinstance(t, str) else tuple(t)
+    )
     complex_templates = candidate_templates[
-        candidate_templates["template"].isin(complex_token_set)
+        template_tuples.map(complex_token_set.__contains__)
     ].copy()
     standard_templates = candidate_templates[
-        candidate_templates["template"].isin(standard_token_set)
+        template_tuples.map(standard_token_set.__contains__)
     ].copy()
 
     print(f"Complex templates: {len(complex_templates)}")
@@ -103,7 +108,7 @@ def _build_profile_and_pad(
     df: pd.DataFrame,
     firm_template_map: pd.DataFrame,
     candidates: pd.DataFrame,
-    low_investor_firms: List[str],
+    low_investor_firms: np.ndarray,
     n_pad: int,
 ) -> pd.DataFrame:
     """
@@ -114,13 +119,13 @@ def _build_profile_and_pad(
         df (pd.DataFrame): The original investor-level dataset.
         firm_template_map (pd.DataFrame): Precomputed firm-to-template mappings.
         candidates (pd.DataFrame): Candidate templates with structure and flag probabilities.
-        low_investor_firms (List[str]): List of firm names with too few original entries.
+        low_investor_firms (np.ndarray): Firm names with too few original entries.
         n_pad (int): Number of synthetic rows to generate per low-investor firm.
 
     Returns:
         pd.DataFrame: The augmented dataset including synthetic investors.
     """
-    if not low_investor_firms or n_pad <= 0:
+    if len(low_investor_firms) == 0 or n_pad <= 0:
         return df.copy()
 
     # Build profiles
@@ -134,15 +139,27 @@ def _build_profile_and_pad(
         n_padding=n_pad,
     )
 
-    # flatten into one DataFrame
-    synthetic_df = pd.concat(
-        [df for df in synthetic_map.values() if not df.empty], ignore_index=True
-    )
+    # append to original in a single concat, no intermediate synthetic frame
+    synthetic = [syn for syn in synthetic_map.values() if not syn.empty]
+    if not synthetic:
+        return df.copy()
 
-    # append to original
-    df_padded = pd.concat([df, synthetic_df], ignore_index=True)
+    return pd.concat([df, *synthetic], ignore_index=True, copy=False)
 
-    return df_padded
+
+def _save_ids(path: Path, ids, header: str) -> None:
+    """
+    Writes ids as a single column CSV, straight from the array with no DataFrame
+    in between.
+
+    Args:
+        path (Path): Output CSV path.
+        ids: Integer ids to write.
+        header (str): Column header.
+    """
+    np.savetxt(
+        path, np.asarray(ids, dtype=np.int64), fmt="%d", header=header, comments=""
+    )
 
 
 def _stratify_split_and_save(
@@ -171,20 +188,23 @@ def _stratify_split_and_save(
         df_orig, val_ratio=test_ratio, test_ratio=0.3, seed=seed
     )
 
-    # Exclude val + test rows from augmented set to get training set
-    used_ids = set(val_ids) | set(test_ids)
-    train_ids = list(set(df_aug["id"]) - used_ids)
+    # Exclude val + test rows from augmented set to get training set, as sorted
+    # unique ids straight from the id arrays
+    aug_ids = df_aug["id"].to_numpy()
+    train_ids = np.setdiff1d(
+        aug_ids, np.asarray(val_ids + test_ids, dtype=aug_ids.dtype)
+    )
 
     # Save all three splits
-    pd.DataFrame({"train_ids": train_ids}).to_csv(
-        TRAIN_AND_VAL_IDS_DIRECTORY / f"train_{file_suffix}_ids.csv", index=False
-    )
-    pd.DataFrame({"val_ids": val_ids}).to_csv(
-        TRAIN_AND_VAL_IDS_DIRECTORY / f"val_{file_suffix}_ids.csv", index=False
+    _save_ids(
+        TRAIN_AND_VAL_IDS_DIRECTORY / f"train_{file_suffix}_ids.csv",
+        train_ids,
+        "train_ids",
     )
-    pd.DataFrame({"test_ids": test_ids}).to_csv(
-        TEST_IDS_DIRECTORY / f"test_{file_suffix}_ids.csv", index=False
+    _save_ids(
+        TRAIN_AND_VAL_IDS_DIRECTORY / f"val_{file_suffix}_ids.csv", val_ids, "val_ids"
     )
+    _save_ids(TEST_IDS_DIRECTORY / f"test_{file_suffix}_ids.csv", test_ids, "test_ids")
 
     print(f"[{file_suffix.upper()}] train/val/test split saved:")
     print(f"Train: {len(train_ids)} | Val: {len(val_ids)} | Test: {len(test_ids)}")
@@ -222,13 +242,14 @@ def _prepare_training_data(
     # Get firm template map
     firm_template_map = read_table(TableName.FIRM_TEMPLATE_MAP)
 
-    # Find low investor firms
-    low_investor_firms_std = firm_template_map[
-        firm_template_map["num_investors"] < low_investor_thresh_std
-    ]["firm"].tolist()
-    low_investor_firms_comp = firm_template_map[
-        firm_template_map["num_investors"] < low_investor_thresh_comp
-    ]["firm"].tolist()
+    # Find low investor firms, kept as arrays since they only feed isin lookups
+    num_investors = firm_template_map["num_investors"]
+    low_investor_firms_std = firm_template_map.loc[
+        num_investors < low_investor_thresh_std, "firm"
+    ].to_numpy()
+    low_investor_firms_comp = firm_template_map.loc[
+        num_investors < low_investor_thresh_comp, "firm"
+    ].to_numpy()
 
     # Build firm profiles for each data set
     std_augmented = _build_profile_and_pad(
@@ -1,11 +1,13 @@
 import os
 import pandas as pd
+from typing import Optional
 
 # Constants
 # ------------------------------------------
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
 EXCEL_FILE = os.path.join(DATA_DIR, "LP and GP data.xlsx")
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
 
 # Extract Functions
 # ------------------------------------------
@@ -25,7 +27,43 @@ def extract_excel_data(sheet_name: str) -> pd.DataFrame:
     if not os.path.exists(EXCEL_FILE):
         raise FileNotFoundError(f"Excel file not found: {EXCEL_FILE}")
 
+    # Parquet copy of the sheet, valid while the workbook's mtime matches its stamp
+    cache_path = os.path.join(CACHE_DIR, f"{sheet_name}.parquet")
+    stamp_path = os.path.join(CACHE_DIR, f"{sheet_name}.stamp")
+    stamp = str(os.stat(EXCEL_FILE).st_mtime_ns)
+
+    if os.path.exists(cache_path) and _read_stamp(stamp_path) == stamp:
+        df = pd.read_parquet(cache_path, engine="pyarrow")
+        print(f"Read from {sheet_name} (cached)")
+        return df
+
     df = pd.read_excel(EXCEL_FILE, sheet_name=sheet_name)
 
+    # Stamp is written last, so a failed write never validates a stale cache
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(cache_path, engine="pyarrow")
+        with open(stamp_path, "w") as f:
+            f.write(stamp)
+    except (OSError, ValueError, TypeError) as e:
+        # Mixed type columns have no Arrow type, such sheets are just not cached
+        print(f"Could not cache {sheet_name}: {e}")
+
     print(f"Read from {sheet_name}")
     return df
+
+
+def _read_stamp(stamp_path: str) -> Optional[str]:
+    """Read a cache stamp file.
+
+    Args:
+        stamp_path (str): Path to the stamp file.
+
+    Returns:
+        Optional[str]: The stamp, or None if the file does not exist.
+    """
+    try:
+        with open(stamp_path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
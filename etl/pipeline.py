@@ -8,7 +8,11 @@ from etl.transform.cleaning import (
     drop_rows_missing_emails,
     drop_emails_with_invalid_local,
 )
-from etl.transform.validate import flag_shared_domain, flag_multi_domain_firms
+from etl.transform.validate import (
+    email_domain,
+    flag_shared_domain,
+    flag_multi_domain_firms,
+)
 
 
 def _process_table(table: TableName, is_gp: bool = False) -> pd.DataFrame:
@@ -38,9 +42,10 @@ def _process_table(table: TableName, is_gp: bool = False) -> pd.DataFrame:
     clean_df = drop_rows_missing_emails(clean_df)
     clean_df = drop_emails_with_invalid_local(clean_df)
 
-    # Flagging
-    clean_df = flag_shared_domain(clean_df)
-    clean_df = flag_multi_domain_firms(clean_df)
+    # Flagging, both flags share one domain extraction
+    domain = email_domain(clean_df["email"])
+    clean_df = flag_shared_domain(clean_df, domain)
+    clean_df = flag_multi_domain_firms(clean_df, domain)
 
     return clean_df
 
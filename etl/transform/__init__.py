@@ -5,7 +5,12 @@ Transform package for ETL.
 """
 
 from .standardise import standardise_table
-from .validate import validate_table, flag_multi_domain_firms, flag_shared_domain
+from .validate import (
+    validate_table,
+    flag_multi_domain_firms,
+    flag_shared_domain,
+    email_domain,
+)
 from .transformer import transform_table
 from .cleaning import (
     drop_rows_missing_emails,
@@ -20,4 +25,5 @@ __all__ = [
     "drop_emails_with_invalid_local",
     "flag_multi_domain_firms",
     "flag_shared_domain",
+    "email_domain",
 ]
@@ -1,4 +1,32 @@
+import re
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Generic noise in one alternation: paste artifacts, runs of whitespace and
+# trailing punctuation. The branches never start on the same character, so a
+# single pass matches the old strip, collapse, remove sequence.
+_GENERIC_NOISE = re.compile(r"[\"'<>]|\s{2,}|[.,;:!?)}\]]+$")
+
+# Protocol and junk characters in one pass. Query strings are cut separately
+# afterwards, the cut has to see the URL with junk already removed.
+_URL_NOISE = re.compile(r"^https?://|[\"'<>]")
+_URL_QUERY = re.compile(r"[?#].*$")
+
+
+def _replace_generic_noise(match: re.Match) -> str:
+    # Whitespace runs collapse to a single space, everything else is dropped
+    return " " if match.group()[0].isspace() else ""
+
+
+def _clean_generic(series: pd.Series, normalised: bool) -> pd.Series:
+    # Module level so columns can be cleaned in worker processes
+    mask = series.notna()
+    cleaned = series[mask]
+    if not normalised:
+        cleaned = cleaned.astype(str).str.strip().str.lower()
+    cleaned = cleaned.str.replace(_GENERIC_NOISE, _replace_generic_noise, regex=True)
+    return series.where(~mask, cleaned)
 
 
 def _normalise_table(df: pd.DataFrame) -> pd.DataFrame:
@@ -13,10 +41,11 @@ def _normalise_table(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Normalised Data
     """
-    df = df.copy()
+    # Shallow copy, columns are replaced below rather than written into
+    df = df.copy(deep=False)
 
     # Normalise all text fields
-    object_cols = df.select_dtypes(include="object").columns
+    object_cols = df.select_dtypes(include=["object", "string"]).columns
     df[object_cols] = df[object_cols].apply(
         lambda col: col.where(col.isna(), col.str.strip().str.lower())
     )
@@ -25,7 +54,9 @@ def _normalise_table(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _regex_cleaning(df: pd.DataFrame) -> pd.DataFrame:
+def _regex_cleaning(
+    df: pd.DataFrame, normalised: bool = False, n_workers: int = 1
+) -> pd.DataFrame:
     """Cleans text fields using regex-based rules.
 
     Applies generic cleaning to all string fields to remove trailing punctuation,
@@ -35,6 +66,10 @@ def _regex_cleaning(df: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df (pd.DataFrame): Input DataFrame containing raw text fields.
+        normalised (bool): Text fields already went through `_normalise_table`, so the
+            generic pass can skip trimming and lower casing them again.
+        n_workers (int): Worker processes for the generic pass, one column each at a
+            time. 1 cleans in process.
 
     Returns:
         pd.DataFrame: Cleaned DataFrame with normalized text fields.
@@ -46,27 +81,15 @@ def _regex_cleaning(df: pd.DataFrame) -> pd.DataFrame:
         if req not in df.columns:
             raise ValueError(f"Input DataFrame must contain an {req} column.")
 
-    df = df.copy()
+    # Shallow copy, columns are replaced below rather than written into
+    df = df.copy(deep=False)
 
     # Define vectorized cleaning helpers
-    def _clean_generic(series: pd.Series) -> pd.Series:
-        mask = series.notna()
-        cleaned = series[mask].astype(str).str.strip().str.lower()
-        cleaned = (
-            cleaned.str.replace(r"[.,;:!?)}\]]+$", "", regex=True)  # Trailing punc
-            .str.replace(r"\s{2,}", " ", regex=True)  # Multiple spaces
-            .str.replace(r"[\"'<>]", "", regex=True)  # Common paste noise
-        )
-        return series.where(~mask, cleaned)
-
     def _clean_url(series: pd.Series) -> pd.Series:
         mask = series.notna()
         cleaned = series[mask].astype(str).str.strip().str.lower()
-        cleaned = (
-            cleaned.str.replace(r"^(https?://)", "", regex=True)  # Remove http/https
-            .str.replace(r"[\"'<>]", "", regex=True)  # Remove junk characters
-            .str.replace(r"[\?#].*$", "", regex=True)  # Remove query string or fragment
-        )
+        cleaned = cleaned.str.replace(_URL_NOISE, "", regex=True)  # Protocol, junk
+        cleaned = cleaned.str.replace(_URL_QUERY, "", regex=True)  # Query, fragment
         return series.where(~mask, cleaned)
 
     def _clean_tel(series: pd.Series) -> pd.Series:
@@ -74,9 +97,20 @@ def _regex_cleaning(df: pd.DataFrame) -> pd.DataFrame:
         cleaned = series[mask].astype(str).str.replace(r"\D", "", regex=True)
         return series.where(~mask, cleaned)  # Keep only digits
 
-    # Clean all generic text fields
-    object_cols = df.select_dtypes(include="object").columns
-    df[object_cols] = df[object_cols].apply(_clean_generic)
+    # Clean all generic text fields. Telephone numbers are skipped, the generic
+    # rules never touch digits and only digits are kept from them anyway.
+    text_cols = df.select_dtypes(include=["object", "string"]).columns.drop(
+        "tel", errors="ignore"
+    )
+    columns = [df[col] for col in text_cols]
+    # The regex callback holds the GIL, so columns go to processes, not threads
+    if n_workers > 1 and len(columns) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            cleaned = list(pool.map(_clean_generic, columns, repeat(normalised)))
+    else:
+        cleaned = [_clean_generic(col, normalised) for col in columns]
+    for col, series in zip(text_cols, cleaned):
+        df[col] = series
 
     # Field-specific logic
     df["linkedin"] = _clean_url(df["linkedin"])
@@ -112,7 +146,7 @@ def _drop_bad_investor_names(df: pd.DataFrame) -> pd.DataFrame:
     mask = (
         df["investor"].notna()
         & df["investor"].str.strip().ne("")
-        & ~df["investor"].str.contains(r"\?", regex=True, na=False)
+        & ~df["investor"].str.contains("?", regex=False, na=False)
     )
 
     # Remove
@@ -123,7 +157,7 @@ def _drop_bad_investor_names(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def standardise_table(df: pd.DataFrame) -> pd.DataFrame:
+def standardise_table(df: pd.DataFrame, n_workers: int = 1) -> pd.DataFrame:
     """Standardises string entires in a given table.
 
     Trims and lowercase normalises all string fields, then
@@ -131,6 +165,7 @@ def standardise_table(df: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df (pd.DataFrame): Table to standardise.
+        n_workers (int): Worker processes for regex cleaning, 1 cleans in process.
 
     Returns:
         pd.DataFrame: Standardised data.
@@ -138,8 +173,8 @@ def standardise_table(df: pd.DataFrame) -> pd.DataFrame:
     # Normalise table
     df = _normalise_table(df)
 
-    # Regex clean
-    df = _regex_cleaning(df)
+    # Regex clean, text is already trimmed and lower cased
+    df = _regex_cleaning(df, normalised=True, n_workers=n_workers)
 
     # Remove bad investor names
     df = _drop_bad_investor_names(df)
@@ -1,3 +1,4 @@
+import pandas as pd
 from db.db import read_table
 from db.models import TableName
 from etl.transform.standardise import standardise_table
@@ -24,8 +25,10 @@ def transform_table(table: TableName) -> dict:
     if table is not TableName.GP and table is not TableName.LP:
         raise ValueError("Non raw table selected for cleaning.")
 
-    # Get table data
+    # Get table data, text held as Arrow strings while transforming
     df = read_table(table=table)
+    text_cols = df.select_dtypes(include="object").columns
+    df = df.astype({col: "string[pyarrow]" for col in text_cols})
 
     # Standardise fields
     df = standardise_table(df)
@@ -33,4 +36,22 @@ def transform_table(table: TableName) -> dict:
     # Validate key fields
     validation = validate_table(df)
 
-    return {"final_df": df, "validation": validation}
+    return {"final_df": _to_object_text(df, text_cols), "validation": validation}
+
+
+def _to_object_text(df: pd.DataFrame, text_cols: pd.Index) -> pd.DataFrame:
+    """Converts Arrow string columns back to object columns with None for missing values.
+
+    Downstream cleaning and database writes expect the frame as read, where missing
+    text is None rather than pd.NA.
+
+    Args:
+        df (pd.DataFrame): Transformed table.
+        text_cols (pd.Index): Columns converted to Arrow strings.
+
+    Returns:
+        pd.DataFrame: Table with object text columns.
+    """
+    text = df[text_cols].astype(object)
+    df[text_cols] = text.where(text.notna(), None)
+    return df
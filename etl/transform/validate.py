@@ -1,14 +1,35 @@
 import pandas as pd
-from typing import List
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import List, Optional
 
+# Valid email address, anchored so RE2 matches the whole string
+_EMAIL_PATTERN = r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$"
 
-def flag_shared_domain(df_to_flag: pd.DataFrame) -> pd.DataFrame:
+
+def email_domain(email: pd.Series) -> pd.Series:
+    """Extracts the lower cased domain of each email, the part after the first '@'.
+
+    Args:
+        email (pd.Series): Email addresses.
+
+    Returns:
+        pd.Series: Domains, missing where there is no email or no '@'.
+    """
+    return email.str.split("@", n=1).str[1].str.lower()
+
+
+def flag_shared_domain(
+    df_to_flag: pd.DataFrame, domain: Optional[pd.Series] = None
+) -> pd.DataFrame:
     """Flags rows that belong to shared email infrastructure domains (used by multiple firms).
 
     Adds a boolean 'is_shared_infra' column to the returned DataFrame.
 
     Args:
         df_to_flag (pd.DataFrame): DataFrame with at least 'email' and 'firm' columns.
+        domain (Optional[pd.Series]): Precomputed `email_domain` of the rows, extracted
+            from 'email' when not given.
 
     Returns:
         pd.DataFrame: Copy of the input DataFrame with 'is_shared_infra' column added.
@@ -22,24 +43,21 @@ def flag_shared_domain(df_to_flag: pd.DataFrame) -> pd.DataFrame:
         if req not in df_to_flag.columns:
             raise ValueError(f"Missing required {req} field!")
 
-    df = df_to_flag.copy()
+    # Shallow copy, only new columns are added to it
+    df = df_to_flag.copy(deep=False)
 
-    # Extract domain
-    df["domain"] = df["email"].str.extract("@(.*)$")[0].str.lower()
+    # Extract domain, unless the caller already has it
+    df["domain"] = email_domain(df["email"]) if domain is None else domain
 
-    # Count firms per domain
-    domain_firm_counts = (
-        df.groupby("domain")["firm"].nunique().sort_values(ascending=False)
-    )
-    shared_domains = domain_firm_counts[domain_firm_counts > 1]
-
-    # Flag shared infrastructure domains
-    df["is_shared_infra"] = df["domain"].isin(shared_domains.index)
+    # Flag shared infrastructure domains, firms per domain broadcast to each row
+    df["is_shared_infra"] = df.groupby("domain")["firm"].transform("nunique").gt(1)
 
     return df.drop(columns=["domain"])
 
 
-def flag_multi_domain_firms(df_to_flag: pd.DataFrame) -> pd.DataFrame:
+def flag_multi_domain_firms(
+    df_to_flag: pd.DataFrame, domain: Optional[pd.Series] = None
+) -> pd.DataFrame:
     """
     Flags rows belonging to firms that use multiple email domains.
 
@@ -47,6 +65,8 @@ def flag_multi_domain_firms(df_to_flag: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df_to_flag (pd.DataFrame): DataFrame with at least 'email' and 'firm' columns.
+        domain (Optional[pd.Series]): Precomputed `email_domain` of the rows, extracted
+            from 'email' when not given.
 
     Returns:
         pd.DataFrame: Copy of the input DataFrame with 'firm_is_multi_domain' column added.
@@ -60,19 +80,14 @@ def flag_multi_domain_firms(df_to_flag: pd.DataFrame) -> pd.DataFrame:
         if req not in df_to_flag.columns:
             raise ValueError(f"Missing required {req} field!")
 
-    df = df_to_flag.copy()
+    # Shallow copy, only new columns are added to it
+    df = df_to_flag.copy(deep=False)
 
-    # Extract domain
-    df["domain"] = df["email"].str.extract("@(.*)$")[0].str.lower()
-
-    # Count domains per firm
-    firm_domain_counts = (
-        df.groupby("firm")["domain"].nunique().sort_values(ascending=False)
-    )
-    multi_domain_firms = firm_domain_counts[firm_domain_counts > 1]
+    # Extract domain, unless the caller already has it
+    df["domain"] = email_domain(df["email"]) if domain is None else domain
 
-    # Flag firms using multiple domains
-    df["firm_is_multi_domain"] = df["firm"].isin(multi_domain_firms.index)
+    # Flag firms using multiple domains, domains per firm broadcast to each row
+    df["firm_is_multi_domain"] = df.groupby("firm")["domain"].transform("nunique").gt(1)
 
     return df.drop(columns=["domain"])
 
@@ -102,26 +117,25 @@ def _validate_email_field(df: pd.DataFrame) -> List[int]:
     # Check whether email is missing
     is_missing = email.isna()
 
-    # Pre-filter non-missing only once
-    non_missing = email[~is_missing]
+    # Length and format checks run in Arrow kernels over the string buffer,
+    # missing emails come out null and are filled as valid here
+    values = pa.array(email, type=pa.string(), from_pandas=True)
+    lengths = pc.utf8_length(values)
+    is_invalid_length = pc.fill_null(
+        pc.or_(pc.less(lengths, 10), pc.greater(lengths, 45)), False
+    ).to_numpy(zero_copy_only=False)
+    is_invalid_format = pc.fill_null(
+        pc.invert(pc.match_substring_regex(values, _EMAIL_PATTERN)), False
+    ).to_numpy(zero_copy_only=False)
 
-    # Length check
-    is_invalid_length = non_missing.str.len().lt(10) | non_missing.str.len().gt(45)
-
-    # Format check
-    email_regex = r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$"
-    is_invalid_format = ~non_missing.str.match(email_regex)
-
-    # Combine
-    bad_index = is_missing[is_missing].index.union(
-        non_missing[is_invalid_length | is_invalid_format].index
-    )
+    # Combine as one row aligned mask
+    is_bad = is_missing.to_numpy() | is_invalid_length | is_invalid_format
 
     print(f"{is_invalid_length.sum()} invalid email lengths found!")
     print(f"{is_missing.sum()} missing emails!")
     print(f"{is_invalid_format.sum()} invalid email formats found!")
 
-    return df.loc[bad_index, "id"].tolist()
+    return df.loc[is_bad, "id"].tolist()
 
 
 def _validate_linkedin(df: pd.DataFrame) -> List[int]:
@@ -143,9 +157,10 @@ def _validate_linkedin(df: pd.DataFrame) -> List[int]:
     # Check whether LinkedIn is missing
     is_missing = df["linkedin"].isna()
 
-    # Regex rules to validate LinkedIn url
+    # Profile urls must contain the fixed path, a plain substring search
     is_invalid = (
-        ~df["linkedin"].str.contains(r"linkedin\.com/in/", na=False) & ~is_missing
+        ~df["linkedin"].str.contains("linkedin.com/in/", regex=False, na=False)
+        & ~is_missing
     )
 
     print(f"{is_invalid.sum()} invalid LinkedIns found!")
@@ -269,8 +284,6 @@ def validate_table(df: pd.DataFrame) -> dict:
             "missing_email_and_linkedin": Rows missing both email and LinkedIn,
         }
     """
-    df = df.copy()
-
     # Flag invalid emails
     invalid_email = _validate_email_field(df)
 
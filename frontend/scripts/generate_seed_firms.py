@@ -15,12 +15,27 @@ df = df.rename(columns={"firm": "firm_name", "domain_name": "domain"})
 # Drop empty or invalid values
 df = df.dropna(subset=["firm_name", "domain"])
 
-# Group by firm and aggregate unique domains into sorted lists
-firm_to_domains: dict[str, list[str]] = (
-    df.groupby("firm_name")["domain"]
-    .apply(lambda x: sorted(set(map(str.lower, x))))  # deduplicate + normalize case
-    .to_dict()
+# Unique (firm, domain) pairs in firm then domain order, the firm id is the
+# firm's position in that order
+pairs = (
+    df[["firm_name", "domain"]]
+    .drop_duplicates()
+    .sort_values(["firm_name", "domain"], ignore_index=True)
 )
+firm_ids, firms = pd.factorize(pairs["firm_name"])
+pairs["firm_id"] = firm_ids + 1
+
+# Escape quotes for every value up front
+safe_firms = pd.Series(firms).str.replace("'", "''", regex=False)
+pairs["domain"] = pairs["domain"].str.replace("'", "''", regex=False)
+
+
+def write_values(f, rows):
+    """Streams rows as a comma separated VALUES list, no joined string in memory."""
+    rows = iter(rows)
+    f.write(next(rows, ""))
+    f.writelines(f",\n{row}" for row in rows)
+
 
 output_path = "prisma/seed_firms.sql"
 
@@ -32,31 +47,23 @@ with open(output_path, "w", encoding="utf-8") as f:
 
     # Insert firms in one statement
     f.write("-- Insert firms\n")
-    firm_values = []
-    for firm in firm_to_domains.keys():
-        safe_firm = firm.replace("'", "''")
-        firm_values.append(f"('{safe_firm}')")
-
     f.write("INSERT INTO \"Firm\" (name) VALUES\n")
-    f.write(",\n".join(firm_values))
+    write_values(f, (f"('{firm}')" for firm in safe_firms))
     f.write(";\n\n")
 
     # Insert domains in batches
     f.write("-- Insert domains\n")
     batch_size = 5000  # adjust if needed for memory or psql limits
-    domain_rows = []
-    firm_id = 1
-    for firm, domains in firm_to_domains.items():
-        for domain in domains:
-            safe_domain = domain.replace("'", "''")
-            domain_rows.append(f"('{safe_domain}', {firm_id})")
-        firm_id += 1
-
-    # Write domains in batches
-    for i in range(0, len(domain_rows), batch_size):
-        batch = domain_rows[i:i + batch_size]
+    for i in range(0, len(pairs), batch_size):
+        batch = pairs.iloc[i:i + batch_size]
         f.write("INSERT INTO \"Domain\" (domain, \"firmId\") VALUES\n")
-        f.write(",\n".join(batch))
+        write_values(
+            f,
+            (
+                f"('{domain}', {firm_id})"
+                for domain, firm_id in zip(batch["domain"], batch["firm_id"])
+            ),
+        )
         f.write(";\n")
 
     f.write("COMMIT;\n")
@@ -1,9 +1,14 @@
 import random
+import string
 from db.db import read_table
 from db.models import TableName
 from fuzzlookup.resolver import FirmResolver
 from typing import List
 
+# Typo kinds and letters inserted, built once rather than per call
+_TYPO_TYPES = ("swap", "delete", "insert")
+_TYPO_CHARS = string.ascii_lowercase
+
 
 def _add_typo(word) -> str:
     """Introduce a single character-level typo into a word.
@@ -21,13 +26,13 @@ def _add_typo(word) -> str:
         return word
     # Randomly select manipulations
     idx = random.randint(0, len(word) - 2)
-    typo_type = random.choice(["swap", "delete", "insert"])
+    typo_type = random.choice(_TYPO_TYPES)
     if typo_type == "swap":
         return word[:idx] + word[idx + 1] + word[idx] + word[idx + 2 :]
     elif typo_type == "delete":
         return word[:idx] + word[idx + 1 :]
     elif typo_type == "insert":
-        char = random.choice("abcdefghijklmnopqrstuvwxyz")
+        char = random.choice(_TYPO_CHARS)
         return word[:idx] + char + word[idx:]
     return word
 
@@ -44,21 +49,20 @@ def _generate_noisy_variants(name: str) -> List[str]:
     Returns:
         list[str]: A list of perturbed versions of the input name.
     """
-    variants = set(
-        [
-            name.lower(),
-            name.upper(),
-            name.title(),
-            name.replace(" ", ""),
-            name + " Inc",
-            _add_typo(name),  # Multiple typo types, since process is random
-            _add_typo(name),
-            _add_typo(name),
-            _add_typo(name.title()),
-            _add_typo(name.title()),
-            _add_typo(name.title()),
-        ]
-    )
+    title = name.title()
+    variants = {
+        name.lower(),
+        name.upper(),
+        title,
+        name.replace(" ", ""),
+        name + " Inc",
+        _add_typo(name),  # Multiple typo types, since process is random
+        _add_typo(name),
+        _add_typo(name),
+        _add_typo(title),
+        _add_typo(title),
+        _add_typo(title),
+    }
     variants.discard(name)
     return list(variants)
 
@@ -81,27 +85,16 @@ def populate_cache_with_noise() -> None:
 
     # Get canonical firm-domain pairs
     canon_df = read_table(TableName.CANONICAL_FIRMS)
-    noisy_rows = []
-
-    # Save noisy inputs with matching score
-    seen = set()
-    for firm, domain in canon_df[["firm", "domain"]].drop_duplicates().values:
-        for noisy in _generate_noisy_variants(firm):
-            if noisy in seen:
-                continue
-            seen.add(noisy)
-            # Score noisy input (saves to DB in resolver)
-            raw_firm, canonical_firm, matched_domain, match_score = resolver.resolve(
-                noisy
-            )
-            noisy_rows.append(
-                {
-                    "raw_firm": raw_firm,
-                    "canonical_firm": canonical_firm,
-                    "domain": matched_domain,
-                    "match_score": match_score,
-                }
-            )
+
+    # Unique noisy inputs in first seen order
+    noisy = dict.fromkeys(
+        variant
+        for firm in canon_df[["firm", "domain"]].drop_duplicates()["firm"]
+        for variant in _generate_noisy_variants(firm)
+    )
+
+    # Score all noisy inputs in one batch (saves to DB in resolver)
+    resolver.resolve_many(list(noisy))
 
 
 if __name__ == "__main__":
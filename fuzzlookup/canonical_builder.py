@@ -1,3 +1,6 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from db.db import read_table, write_table, init_db
 from db.models import TableName
 
@@ -13,14 +16,12 @@ def build_canonical_firms() -> None:
     """
     init_db()
 
-    # Domain extractor splitter
-    def extract_domain(email: str) -> str:
-        return email.split("@")[1].strip().lower()
-
     # Read clean data
     df = read_table(TableName.COMBINED_CLEAN, columns=["firm", "email"]).copy()
-    # Extract domains
-    df["domain"] = df["email"].apply(extract_domain)
+    # Extract domains, the part after the first "@", in Arrow kernels
+    parts = pc.split_pattern(pa.array(df["email"], type=pa.string()), "@", max_splits=2)
+    domain = pc.utf8_lower(pc.utf8_trim_whitespace(pc.list_element(parts, 1)))
+    df["domain"] = pd.Series(pd.arrays.ArrowStringArray(domain), index=df.index)
 
     # Normalize firm names
     df["firm"] = df["firm"].astype(str).str.lower()
@@ -32,11 +33,10 @@ def build_canonical_firms() -> None:
         .rename(columns={"size": "n"})
     )
 
-    # Pick most used domain per firm
+    # Pick most used domain per firm, the first row of each firm after one sort
     most = (
         counts.sort_values(["firm", "n", "domain"], ascending=[True, False, True])
-        .groupby("firm", as_index=False)
-        .head(1)[["firm", "domain"]]
+        .drop_duplicates("firm")[["firm", "domain"]]
         .reset_index(drop=True)
     )
 
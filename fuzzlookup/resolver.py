@@ -1,8 +1,21 @@
 from rapidfuzz import process, fuzz
 from db.db import read_table, write_table
 from db.models import TableName
+from typing import List
+import numpy as np
 import pandas as pd
 
+# Cache table columns, in resolve result order
+_CACHE_COLUMNS = ["raw_firm", "canonical_firm", "domain", "match_score"]
+
+# Pending cache rows written to the database in one go
+_FLUSH_SIZE = 1000
+
+
+def _sort_tokens(name: str) -> str:
+    # The string token_sort_ratio scores, so plain ratio on it gives the same score
+    return " ".join(sorted(name.split()))
+
 
 class FirmResolver:
     """
@@ -18,18 +31,23 @@ class FirmResolver:
         cache (dict): In-memory cache of previous fuzzy matches.
         _canonical_names (list[str]): List of canonical firm names for matching.
         _firm_to_domain (dict): Mapping from canonical firm to domain.
+        _canon_sorted (list[str]): Canonical names with tokens sorted, for matching.
+        _pending (list[tuple]): New cache rows not yet written to the database.
     """
 
     def __init__(self, threshold: int = 85):
         self.threshold = threshold
         self.canonical_df = read_table(TableName.CANONICAL_FIRMS)
         self.cache = self._load_cache()
+        self._pending = []
 
         # Precompile search space
         self._canonical_names = self.canonical_df["firm"].tolist()
         self._firm_to_domain = dict(
             zip(self.canonical_df["firm"], self.canonical_df["domain"])
         )
+        # Token sorted once here, so matching is a plain ratio per pair
+        self._canon_sorted = [_sort_tokens(name) for name in self._canonical_names]
 
     def _load_cache(self) -> dict:
         """
@@ -57,7 +75,8 @@ class FirmResolver:
 
         First checks the cache for a match. If not found, performs an
         exact or fuzzy match against the canonical list. If matched, the
-        result is stored in the cache and written to the database.
+        result is stored in the cache and queued for the database, pending
+        rows are written every `_FLUSH_SIZE` matches or on `flush`.
 
         Args:
             raw_firm (str): The firm name to resolve.
@@ -80,30 +99,100 @@ class FirmResolver:
             domain = self._firm_to_domain[raw_firm]
             score = 100
         else:
-            # Fuzzy match
-            match, score, _ = process.extractOne(
-                raw_firm,
-                self._canonical_names,
-                scorer=fuzz.token_sort_ratio,
+            # Fuzzy match, token sort ratio over the presorted names
+            _, score, idx = process.extractOne(
+                _sort_tokens(raw_firm),
+                self._canon_sorted,
+                scorer=fuzz.ratio,
                 processor=None,  # skip preprocessing
             )
             if score < self.threshold:
                 return raw_firm, None, None, score
-            canonical_firm = match
-            domain = self._firm_to_domain[match]
-
-        # Cache it
-        result_df = pd.DataFrame(
-            [
-                {
-                    "raw_firm": raw_firm,
-                    "canonical_firm": canonical_firm,
-                    "domain": domain,
-                    "match_score": score,
-                }
-            ]
-        )
-        write_table(TableName.FIRM_CACHE, result_df)
+            canonical_firm = self._canonical_names[idx]
+            domain = self._firm_to_domain[canonical_firm]
+
+        # Cache it, the database write is deferred
+        self._pending.append((raw_firm, canonical_firm, domain, score))
+        if len(self._pending) >= _FLUSH_SIZE:
+            self.flush()
         self.cache[raw_firm] = (canonical_firm, domain, score)
 
         return raw_firm, canonical_firm, domain, score
+
+    def resolve_many(
+        self, raw_firms: List[str], chunk_size: int = 1024
+    ) -> List[tuple[str, str, str, int]]:
+        """
+        Resolves many raw firm names at once.
+
+        Gives the same results as calling `resolve` on each name. Fuzzy matches are
+        scored in chunks with `process.cdist` across all cores instead of one
+        `extractOne` per name, and new matches are written to the cache table in a
+        single write along with any rows still pending from `resolve`.
+
+        Args:
+            raw_firms (List[str]): The firm names to resolve.
+            chunk_size (int): Names scored per `cdist` call, bounds the score matrix.
+
+        Returns:
+            List[tuple[str, str, str, int]]: One `resolve` result per input name.
+        """
+        results = {}
+        new_rows = []
+        fuzzy = []
+        for raw_firm in dict.fromkeys(raw_firms):
+            if raw_firm in self.cache:
+                canonical_firm, domain, score = self.cache[raw_firm]
+                results[raw_firm] = (raw_firm, canonical_firm, domain, score)
+            elif raw_firm in self._firm_to_domain:
+                new_rows.append(
+                    (raw_firm, raw_firm, self._firm_to_domain[raw_firm], 100)
+                )
+            else:
+                fuzzy.append(raw_firm)
+
+        # Best canonical match per name, argmax keeps the first of tied scores
+        # as extractOne does
+        for start in range(0, len(fuzzy), chunk_size):
+            chunk = fuzzy[start : start + chunk_size]
+            scores = process.cdist(
+                [_sort_tokens(raw_firm) for raw_firm in chunk],
+                self._canon_sorted,
+                scorer=fuzz.ratio,
+                processor=None,
+                dtype=np.float64,
+                workers=-1,
+            )
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(chunk)), best].tolist()
+            for raw_firm, idx, score in zip(chunk, best.tolist(), best_scores):
+                if score < self.threshold:
+                    results[raw_firm] = (raw_firm, None, None, score)
+                    continue
+                match = self._canonical_names[idx]
+                new_rows.append((raw_firm, match, self._firm_to_domain[match], score))
+
+        # Cache them
+        for raw_firm, canonical_firm, domain, score in new_rows:
+            self.cache[raw_firm] = (canonical_firm, domain, score)
+            results[raw_firm] = (raw_firm, canonical_firm, domain, score)
+        self._pending.extend(new_rows)
+        self.flush()
+
+        return [results[raw_firm] for raw_firm in raw_firms]
+
+    def flush(self) -> None:
+        """
+        Writes pending cache rows to the database in a single write.
+        """
+        if not self._pending:
+            return
+        write_table(
+            TableName.FIRM_CACHE, pd.DataFrame(self._pending, columns=_CACHE_COLUMNS)
+        )
+        self._pending = []
+
+    def __del__(self):
+        # Last chance write for rows resolved without a final flush
+        if getattr(self, "_pending", None):
+            self.flush()
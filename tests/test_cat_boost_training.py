@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from email_prediction.cat_boost_training import _compute_ranking_metrics
+
+
+def test_compute_ranking_metrics_uneven_groups_and_tie():
+    # Groups interleaved and unsorted, sizes 3, 1, 4, 2 and 3
+    df = pd.DataFrame(
+        [
+            (30, 0.7, 0),  # tied top score with the hit below, comes first
+            (10, 0.9, 0),
+            (50, 0.8, 0),
+            (20, 0.3, 1),  # single row group, hit at rank 0
+            (30, 0.7, 1),
+            (10, 0.5, 1),  # hit at rank 1
+            (40, 0.6, 0),  # group without a hit
+            (50, 0.6, 0),
+            (30, 0.2, 0),
+            (10, 0.1, 0),
+            (40, 0.4, 0),
+            (50, 0.4, 1),  # hit at rank 2, outside k
+            (30, 0.1, 0),
+        ],
+        columns=["clean_row_id", "score", "label"],
+    )
+
+    acc1, recall_k, mrr = _compute_ranking_metrics(df, k=2)
+
+    # Hits ranked 1, 0, 1 (tie keeps row order), none and 2
+    assert acc1 == pytest.approx(1 / 5)
+    assert recall_k == pytest.approx(3 / 5)
+    assert mrr == pytest.approx((1 / 2 + 1 + 1 / 2 + 0 + 1 / 3) / 5)
+
+
+def test_compute_ranking_metrics_empty_frame():
+    df = pd.DataFrame({"clean_row_id": [], "score": [], "label": []})
+
+    acc1, recall_k, mrr = _compute_ranking_metrics(df, k=3)
+
+    assert np.isnan(acc1) and np.isnan(recall_k) and np.isnan(mrr)
@@ -117,3 +117,36 @@ def test_build_feature_matrix(
     assert df[df["template_id"] == 10]["label"].iloc[0] == 1
     assert df[df["template_id"] == 11]["label"].iloc[0] == 0
     assert df["firm_diversity_ratio"].unique().tolist() == [2.0]
+
+
+@pytest.mark.integration
+def test_build_feature_matrix_workers_match_in_process(
+    clean_data_df, candidate_templates_df, firm_template_map_df
+):
+    # Several single investor batches, so the pool has work in flight
+    clean = pd.concat([clean_data_df] * 5, ignore_index=True)
+    clean["id"] = range(1, 6)
+    clean["investor"] = [f"Investor {i}" for i in range(1, 6)]
+    clean.loc[[1, 3], "token_seq"] = pd.Series([["first", ".", "last"]] * 2, [1, 3])
+
+    build_feature_matrix(
+        clean,
+        candidate_templates_df,
+        firm_template_map_df,
+        TableName.FEATURE_MATRIX,
+        batch_size=1,
+    )
+    build_feature_matrix(
+        clean,
+        candidate_templates_df,
+        firm_template_map_df,
+        TableName.FEATURE_MATRIX_COMPLEX,
+        batch_size=1,
+        n_workers=2,
+    )
+
+    in_process = read_table(TableName.FEATURE_MATRIX)
+    pooled = read_table(TableName.FEATURE_MATRIX_COMPLEX)
+
+    assert len(pooled) == 10
+    pd.testing.assert_frame_equal(pooled, in_process)
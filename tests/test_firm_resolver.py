@@ -23,7 +23,8 @@ def test_resolver_resolves_and_caches_unit(temp_db):
     assert result[2] == "blackstone.com"
     assert result[3] >= 80
 
-    # Check that it's cached
+    # Check that it's cached once flushed
+    resolver.flush()
     cached = read_table(TableName.FIRM_CACHE)
     assert "Blacstone" in cached["raw_firm"].values
 
@@ -67,9 +68,54 @@ def test_resolver_integrates_with_db(temp_db):
     raw_firms = cleaned["firm"].dropna().unique().tolist()
     for firm in raw_firms:
         resolver.resolve(firm)
+    resolver.flush()
 
     # Validate the cache
     cache = read_table(TableName.FIRM_CACHE)
     assert set(cache["raw_firm"].values) == {"Blacstone", "Goldmann Sacs"}
     assert "Blackstone" in cache["canonical_firm"].values
     assert "Goldman Sachs" in cache["canonical_firm"].values
+
+
+def test_resolve_many_matches_resolve(temp_db):
+    """Batch resolution gives per name results and caches only accepted matches."""
+    canonical = pd.DataFrame(
+        [
+            {"firm": "Blackstone", "domain": "blackstone.com"},
+            {"firm": "Goldman Sachs", "domain": "gs.com"},
+        ]
+    )
+    write_table(TableName.CANONICAL_FIRMS, canonical)
+
+    resolver = FirmResolver(threshold=80)
+    results = resolver.resolve_many(["Blacstone", "Goldman Sachs", "Zzz", "Blacstone"])
+
+    assert [r[1] for r in results] == [
+        "Blackstone",
+        "Goldman Sachs",
+        None,
+        "Blackstone",
+    ]
+    assert results[1][3] == 100
+    assert results[0] == FirmResolver(threshold=80).resolve("Blacstone")
+
+    # Each accepted name is cached once, misses are not
+    cached = read_table(TableName.FIRM_CACHE)
+    assert sorted(cached["raw_firm"]) == ["Blacstone", "Goldman Sachs"]
+
+
+def test_resolve_defers_cache_writes_until_flush(temp_db):
+    """Matches are cached in memory at once and written to the database on flush."""
+    canonical = pd.DataFrame([{"firm": "Blackstone", "domain": "blackstone.com"}])
+    write_table(TableName.CANONICAL_FIRMS, canonical)
+
+    resolver = FirmResolver(threshold=80)
+    resolver.resolve("Blacstone")
+    resolver.resolve("Blackstone")
+
+    assert "Blacstone" in resolver.cache
+    assert read_table(TableName.FIRM_CACHE).empty
+
+    resolver.flush()
+    cached = read_table(TableName.FIRM_CACHE)
+    assert sorted(cached["raw_firm"]) == ["Blackstone", "Blacstone"]
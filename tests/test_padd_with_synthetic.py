@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import json
 from email_prediction.feature_engineering.padding.generate_synthetic_investors import (
     generate_synthetic_investors_for_profiles,
@@ -177,3 +178,24 @@ def test_pad_with_synthetic_and_validate_drift():
     assert (
         drift["global"]["total_flag_drift"] < 0.1
     )  # Should be very low, since flags are sampled from profile
+
+
+def test_worker_processes_match_in_process_generation():
+    # Enough firms for the pool to be used, each with its own templates
+    profiles = {}
+    for i in range(5):
+        prof = make_profile(n_templates=3, weights=[0.5, 0.3, 0.2])["test_firm"]
+        profiles[f"firm_{i}"] = {**prof, "firm": f"firm_{i}", "num_investors": i}
+
+    serial, serial_id = generate_synthetic_investors_for_profiles(
+        profiles, n_padding=20, rng=np.random.default_rng(7)
+    )
+    pooled, pooled_id = generate_synthetic_investors_for_profiles(
+        profiles, n_padding=20, rng=np.random.default_rng(7), n_workers=2
+    )
+
+    assert serial_id == pooled_id
+    assert serial.keys() == pooled.keys()
+    for firm in profiles:
+        assert len(serial[firm]) == 20 - profiles[firm]["num_investors"]
+        pd.testing.assert_frame_equal(serial[firm], pooled[firm])
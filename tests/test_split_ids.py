@@ -62,3 +62,58 @@ def test_domain_distribution_approx_preserved(mock_clean_df):
 
     for domain in full_dist:
         assert abs(full_dist[domain] - test_dist[domain]) < 0.05
+
+
+@pytest.fixture
+def uneven_clean_df():
+    # Domains of 10, 7 and 3 rows plus a singleton, with non consecutive ids
+    domains = ["a.com"] * 10 + ["b.com"] * 7 + ["c.com"] * 3 + ["solo.com"]
+    return pd.DataFrame(
+        {
+            "id": [i * 7 + 3 for i in range(len(domains))],
+            "email": [f"x{i}@{d.upper()}" for i, d in enumerate(domains)],
+        }
+    )
+
+
+def test_split_partitions_ids_and_skips_singleton_domains(uneven_clean_df):
+    val_ids, test_ids = split_clean_ids(
+        uneven_clean_df, val_ratio=0.2, test_ratio=0.3, seed=7
+    )
+    all_ids = set(uneven_clean_df["id"])
+    train_ids = all_ids - set(val_ids) - set(test_ids)
+
+    # Disjoint, no repeats, and together with training every id is covered
+    assert len(set(val_ids)) == len(val_ids)
+    assert len(set(test_ids)) == len(test_ids)
+    assert set(val_ids).isdisjoint(test_ids)
+    assert set(val_ids) | set(test_ids) | train_ids == all_ids
+
+    # The singleton domain row always stays in training
+    solo_id = uneven_clean_df["id"].iloc[-1]
+    assert solo_id in train_ids
+
+
+def test_split_per_domain_counts(uneven_clean_df):
+    val_ids, test_ids = split_clean_ids(
+        uneven_clean_df, val_ratio=0.2, test_ratio=0.3, seed=7
+    )
+    domain = uneven_clean_df.set_index("id")["email"].str.split("@").str[1].str.lower()
+
+    # Position k of n in a domain is test while k / n < 0.3, val while k / n < 0.5
+    assert domain[test_ids].value_counts().to_dict() == {
+        "a.com": 3,
+        "b.com": 3,
+        "c.com": 1,
+    }
+    assert domain[val_ids].value_counts().to_dict() == {
+        "a.com": 2,
+        "b.com": 1,
+        "c.com": 1,
+    }
+
+
+def test_split_depends_on_seed(uneven_clean_df):
+    first = split_clean_ids(uneven_clean_df, seed=1)
+    assert split_clean_ids(uneven_clean_df, seed=1) == first
+    assert any(split_clean_ids(uneven_clean_df, seed=s) != first for s in range(2, 6))
@@ -40,6 +40,47 @@ def test_regex_cleaning_basics():
     assert out["notes"].tolist() == ["messy", "clean"]
 
 
+def test_regex_cleaning_generic_edge_cases():
+    df = pd.DataFrame(
+        {
+            "notes": ["messy .", "messy  .", "end  ?  ", '"?"', 'name."'],
+            "linkedin": [None] * 5,
+            "website": [None] * 5,
+            "tel": [None] * 5,
+        }
+    )
+    out = _regex_cleaning(df)
+    assert out["notes"].tolist() == [
+        "messy ",  # trailing punctuation goes, the space before it stays
+        "messy ",  # and a run of spaces before it collapses
+        "end ",
+        "?",  # only the quotes are noise, the mark is not trailing
+        "name.",  # quotes are stripped after the trailing punctuation check
+    ]
+
+
+def test_regex_cleaning_urls_with_embedded_newlines():
+    df = pd.DataFrame(
+        {
+            "linkedin": [
+                "https://linkedin.com/in/a?x=1\nb",  # query does not run to the end
+                "https://linkedin.com/in/a?x=1\n>",  # noise removal exposes the end
+                "linkedin.com/in/a\n#frag",
+                "https://x.com/a#b\nc?d",
+            ],
+            "website": [None] * 4,
+            "tel": [None] * 4,
+        }
+    )
+    out = _regex_cleaning(df)
+    assert out["linkedin"].tolist() == [
+        "linkedin.com/in/a?x=1\nb",
+        "linkedin.com/in/a",
+        "linkedin.com/in/a\n",
+        "x.com/a#b\nc",
+    ]
+
+
 @pytest.mark.integration
 def test_standardise_table_integration():
     df = pd.DataFrame(
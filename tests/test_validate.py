@@ -28,6 +28,33 @@ def test_validate_email_field():
     assert set(invalid_ids) == {2, 3, 4}
 
 
+@pytest.mark.parametrize("dtype", [object, "string[pyarrow]"])
+def test_validate_email_field_edge_cases(dtype, capsys):
+    long_local = "a" * 34
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "email": pd.Series(
+                [
+                    "john.doe@example.com",  # valid
+                    "john.doe@example.com\n",  # trailing newline, whole string must match
+                    None,  # missing
+                    f"{long_local}@example.com",  # 46 chars, too long
+                    f"{long_local[1:]}@example.com",  # 45 chars, still valid
+                ],
+                dtype=dtype,
+            ),
+        }
+    )
+    assert _validate_email_field(df) == [2, 3, 4]
+
+    # Missing emails only count as missing, not as bad lengths or formats
+    out = capsys.readouterr().out
+    assert "1 invalid email lengths found!" in out
+    assert "1 missing emails!" in out
+    assert "1 invalid email formats found!" in out
+
+
 def test_validate_linkedin():
     df = pd.DataFrame(
         {